@@ -0,0 +1,307 @@
+"""
+Load test of the game handling: many simulated players starting games and checking guesses at
+once, reporting the throughput and the latency percentiles of the `start` and `check` operations.
+
+    python -m bench.load --concurrency 1 100 1000
+    python -m bench.load --mode socket --concurrency 100 1000 --workers 4
+    python -m bench.load --mode socket --connect 127.0.0.1:8765 -o load.json
+
+Every player plays games one after the other: it picks a length, starts a game, then guesses
+random words of the list, or now and then a word that is not in it, until the game is over.
+
+In the "thread" mode the players are threads, each calling its own `Wordle` directly. In the
+"socket" mode they are asyncio tasks, each with a connection to a game server (see
+`game.server`), either the one given with --connect or one started for the run.
+"""
+import argparse
+import asyncio
+import json
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+from pathlib import Path
+
+from config.config import config
+from error import LengthNotExist, LetterNotExist
+from game.server import raise_file_limit
+from game.wordle import Wordle
+from game.word_index import WordIndex, shared_index
+
+ROOT = Path(__file__).resolve().parent.parent
+WORD_LIST = ROOT / "word_list.txt"
+
+MODES = ("thread", "socket")
+OPERATIONS = ("start", "check")
+
+
+class Player:
+    """
+    The choices of a simulated player: the length of each game and the word of each guess.
+    """
+
+    def __init__(self, index: WordIndex, lengths: list[int], invalid_rate: float, seed: int) -> None:
+        self.index = index
+        self.lengths = lengths
+        self.invalid_rate = invalid_rate
+        self.rng = random.Random(seed)
+
+    def length(self) -> int:
+        return self.rng.choice(self.lengths)
+
+    def guess(self, length: int) -> str:
+        """
+        Draws a word of the list, or a word that is not in it with a probability of `invalid_rate`.
+        """
+        bucket = self.index.bucket(length)
+
+        if self.rng.random() >= self.invalid_rate:
+            return bucket[self.rng.randrange(len(bucket))].lower()
+
+        while True:
+            word = "".join(self.rng.choices("abcdefghijklmnopqrstuvwxyz", k=length))
+            if word not in bucket:
+                return word
+
+
+def _play_threads(index: WordIndex, players: list[Player], games: int) -> tuple[list[dict], float]:
+    """
+    Plays the games of every player on a thread of its own, calling Wordle directly.
+
+    :return: The samples of every player, and the time from when they all started to when the last finished.
+    """
+    started = []
+    barrier = threading.Barrier(len(players), action=lambda: started.append(time.perf_counter()))
+    results = [None] * len(players)
+    errors = []
+
+    def play(i: int) -> None:
+        try:
+            results[i] = play_games(players[i])
+        except BaseException as e:
+            errors.append(e)
+            # The other players are not left waiting for this one.
+            barrier.abort()
+
+    def play_games(player: Player) -> dict:
+        game = Wordle(index)
+        samples = {operation: [] for operation in OPERATIONS}
+        rejected = 0
+
+        barrier.wait()
+        for _ in range(games):
+            start = time.perf_counter()
+            game.start(player.length())
+            samples["start"].append(time.perf_counter() - start)
+
+            while game.get_chance() > 0 and not game.get_win_status():
+                word = player.guess(game.get_length())
+
+                start = time.perf_counter()
+                try:
+                    game.check(word)
+                    game.reduce_chance()
+                except (LengthNotExist, LetterNotExist):
+                    rejected += 1
+                samples["check"].append(time.perf_counter() - start)
+
+            game.end()
+
+        return {"samples": samples, "rejected": rejected}
+
+    threads = [threading.Thread(target=play, args=(i,)) for i in range(len(players))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    if errors:
+        # The first error, the players it stopped only failing on the broken barrier.
+        raise errors[0]
+
+    return results, time.perf_counter() - started[0]
+
+
+async def _play_socket(address: tuple[str, int], players: list[Player], games: int) -> tuple[list[dict], float]:
+    """
+    Plays the games of every player on a connection of its own to a game server.
+
+    :return: The samples of every player, and the time from when they all started, once connected,
+             to when the last finished.
+    """
+    connections = [await asyncio.open_connection(*address) for _ in players]
+    ready = asyncio.Event()
+
+    async def play(player: Player, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> dict:
+        samples = {operation: [] for operation in OPERATIONS}
+        rejected = 0
+
+        async def request(operation: str, **arguments) -> dict:
+            start = time.perf_counter()
+            writer.write(json.dumps({"op": operation, **arguments}).encode("utf-8") + b"\n")
+            await writer.drain()
+            reply = json.loads(await reader.readline())
+            samples["check" if operation == "guess" else operation].append(time.perf_counter() - start)
+
+            return reply
+
+        await ready.wait()
+        for _ in range(games):
+            reply = await request("start", length=player.length())
+            if not reply["ok"]:
+                raise RuntimeError(f"The server refused to start a game: {reply['error']}")
+
+            length = reply["length"]
+
+            while True:
+                reply = await request("guess", word=player.guess(length))
+
+                if not reply["ok"]:
+                    rejected += 1
+                elif reply["over"]:
+                    break
+
+        writer.close()
+
+        return {"samples": samples, "rejected": rejected}
+
+    tasks = [asyncio.create_task(play(player, *connection)) for player, connection in zip(players, connections)]
+    start = time.perf_counter()
+    ready.set()
+    results = await asyncio.gather(*tasks)
+
+    return list(results), time.perf_counter() - start
+
+
+def percentiles(samples: list[float]) -> dict:
+    """
+    :return: The p50, p95 and p99 of the samples in milliseconds, None when there are too few of them.
+    """
+    if len(samples) < 2:
+        return {"p50_ms": None, "p95_ms": None, "p99_ms": None}
+
+    cuts = statistics.quantiles(samples, n=100, method="inclusive")
+
+    return {"p50_ms": cuts[49] * 1000, "p95_ms": cuts[94] * 1000, "p99_ms": cuts[98] * 1000}
+
+
+def open_index() -> WordIndex:
+    """
+    Returns the word index the games are played from, with the same options as the game server.
+    """
+    return shared_index(WORD_LIST, config.get("MIN_WORD_LENGTH", 3))
+
+
+def run_level(mode: str, concurrency: int, games: int, lengths: list[int], invalid_rate: float, seed: int,
+              address: tuple[str, int] | None = None) -> dict:
+    """
+    Plays `games` games with each of `concurrency` players at once.
+
+    :return: The time taken, the number of operations and games, the throughput, and the latency
+             percentiles of every operation.
+    """
+    index = open_index()
+    players = [Player(index, lengths, invalid_rate, seed + i) for i in range(concurrency)]
+
+    if mode == "thread":
+        results, elapsed = _play_threads(index, players, games)
+    else:
+        results, elapsed = asyncio.run(_play_socket(address, players, games))
+
+    report = {"players": concurrency, "games": concurrency * games, "time_s": elapsed,
+              "rejected_guesses": sum(result["rejected"] for result in results)}
+
+    operations = 0
+    for operation in OPERATIONS:
+        samples = [sample for result in results for sample in result["samples"][operation]]
+        operations += len(samples)
+        report[operation] = {"count": len(samples), "per_s": len(samples) / elapsed, **percentiles(samples)}
+
+    report["operations_per_s"] = operations / elapsed
+    report["games_per_s"] = report["games"] / elapsed
+
+    return report
+
+
+def _start_server(workers: int) -> tuple[subprocess.Popen, tuple[str, int]]:
+    """
+    Starts a game server on a free local port, and waits until it accepts connections.
+    """
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+
+    process = subprocess.Popen([sys.executable, "main.py", "serve", "--port", str(port), "--workers", str(workers)],
+                               cwd=ROOT, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL)
+
+    deadline = time.monotonic() + 30
+    while True:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return process, ("127.0.0.1", port)
+        except OSError:
+            if process.poll() is not None or time.monotonic() > deadline:
+                process.kill()
+                raise SystemExit("The game server did not start.")
+            time.sleep(0.1)
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("-m", "--mode", choices=MODES, default="thread", help="How the players reach the games")
+    parser.add_argument("-c", "--concurrency", type=int, nargs="+", default=[1, 10, 100, 1000],
+                        help="Numbers of players at once, one run each")
+    parser.add_argument("-n", "--games", type=int, default=10, help="Games played by each player")
+    parser.add_argument("-l", "--lengths", type=int, nargs="+", default=[5], help="Word lengths played")
+    parser.add_argument("--invalid-rate", type=float, default=0.1,
+                        help="Share of guesses that are not in the word list")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the players")
+    parser.add_argument("--connect", help="Address of a running game server, as host:port (socket mode)")
+    parser.add_argument("-w", "--workers", type=int, default=1,
+                        help="Worker processes of the server started for the run (socket mode)")
+    parser.add_argument("-o", "--output", type=Path, help="Write the results to this JSON file")
+
+
+def run(args: argparse.Namespace) -> None:
+    index = open_index()
+    missing = [length for length in args.lengths if length not in index]
+    if missing:
+        raise SystemExit(f"No words of length {', '.join(map(str, missing))} in the word list, the lengths "
+                         f"go from {index.get_min_length()} to {index.get_max_length()}.")
+
+    raise_file_limit()
+
+    server, address = None, None
+    if args.mode == "socket":
+        if args.connect:
+            host, _, port = args.connect.rpartition(":")
+            address = (host or "127.0.0.1", int(port))
+        else:
+            server, address = _start_server(args.workers)
+
+    try:
+        results = {str(concurrency): run_level(args.mode, concurrency, args.games, args.lengths, args.invalid_rate,
+                                               args.seed, address)
+                   for concurrency in args.concurrency}
+    except RuntimeError as e:
+        raise SystemExit(str(e))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    text = json.dumps({"mode": args.mode, "levels": results}, indent=2)
+
+    if args.output:
+        args.output.write_text(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_arguments(parser)
+    run(parser.parse_args())
@@ -0,0 +1,136 @@
+"""
+Measures the resident memory held by the word list in each of its storage layouts.
+
+Every layout is loaded in a fresh interpreter so that the numbers do not leak into each other:
+
+    python -m bench.memory
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import zlib
+
+from pathlib import Path
+
+from game.word_index import WordIndex
+
+ROOT = Path(__file__).resolve().parent.parent
+WORD_LIST = ROOT / "word_list.txt"
+
+VARIANTS = {
+    "strings": "One str per word in a dict of lists (the former Wordle.__word_list)",
+    "packed": "Packed letter codes, all lengths mapped and touched",
+    "packed-lazy": "Packed letter codes, lazy mode after starting one game",
+}
+
+
+def current_rss() -> int | None:
+    """
+    Returns the resident set size of the current process in bytes.
+
+    :return: The RSS in bytes, or None if it cannot be determined on this platform.
+    """
+    if sys.platform.startswith("linux"):
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+
+    if os.name == "nt":
+        import ctypes
+        from ctypes import wintypes
+
+        class ProcessMemoryCounters(ctypes.Structure):
+            _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD)] + [
+                (name, ctypes.c_size_t) for name in (
+                    "PeakWorkingSetSize", "WorkingSetSize", "QuotaPeakPagedPoolUsage", "QuotaPagedPoolUsage",
+                    "QuotaPeakNonPagedPoolUsage", "QuotaNonPagedPoolUsage", "PagefileUsage", "PeakPagefileUsage")
+            ]
+
+        counters = ProcessMemoryCounters()
+        counters.cb = ctypes.sizeof(counters)
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+
+        if ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+            return counters.WorkingSetSize
+
+    return None
+
+
+def load(variant: str, length: int) -> object:
+    """
+    Loads the word list in the given layout and touches every word it keeps in memory.
+
+    :param variant: One of the keys of `VARIANTS`.
+    :param length: The word length played in the lazy layout.
+    :return: The loaded word list, which must be kept alive while measuring.
+    """
+    if variant == "strings":
+        return WordIndex.parse(WORD_LIST)
+
+    index = WordIndex(WORD_LIST, lazy=variant == "packed-lazy")
+
+    lengths = [length] if variant == "packed-lazy" else sorted(index.get_counts())
+    for word_length in lengths:
+        # Read the whole buffer without copying it, so that every page of it is resident.
+        zlib.crc32(index.bucket(word_length).get_buffer())
+
+    return index
+
+
+def measure(variant: str, length: int) -> int | None:
+    """
+    Loads one variant in a child interpreter and returns how much its RSS grew, in bytes.
+
+    :return: The RSS growth, or None if the RSS cannot be read on this platform.
+    """
+    output = subprocess.run(
+        [sys.executable, "-m", "bench.memory", "--child", variant, "--length", str(length)],
+        cwd=ROOT, check=True, capture_output=True, text=True
+    ).stdout
+    sample = json.loads(output)
+
+    return None if sample["before"] is None else sample["after"] - sample["before"]
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--length", type=int, default=5, help="Word length played in the lazy layout")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    parser.add_argument("--child", choices=VARIANTS, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        before = current_rss()
+        words = load(args.child, args.length)
+        after = current_rss()
+
+        print(json.dumps({"before": before, "after": after}))
+        del words
+        return
+
+    # Make sure the compiled index is up to date before any child maps it.
+    WordIndex(WORD_LIST).close()
+
+    results = {variant: measure(variant, args.length) for variant in VARIANTS}
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    reference = results["strings"]
+    for variant, description in VARIANTS.items():
+        rss = results[variant]
+
+        if rss is None:
+            print(f"{variant:<12} unavailable on this platform")
+            continue
+
+        ratio = f"{rss / reference:6.1%} of strings" if reference else ""
+        print(f"{variant:<12} {rss / 2 ** 20:8.2f} MiB  {ratio:<20} {description}")
+
+
+if __name__ == '__main__':
+    main()
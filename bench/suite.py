@@ -0,0 +1,334 @@
+"""
+Times the startup, word list, scoring and rendering hot paths and writes the results as JSON.
+
+Each benchmark runs in a fresh interpreter with its output redirected, on a fixed terminal
+size, so that releases can be compared run against run:
+
+    python -m bench.suite -o results.json
+    python main.py bench -o results.json
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+WORD_LIST = ROOT / "word_list.txt"
+
+# The terminal size the rendering benchmarks run on.
+COLUMNS, LINES = 120, 40
+
+
+class CountingStream(io.TextIOBase):
+    """
+    A text stream that discards what is written to it, counting the bytes and write calls.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.bytes = 0
+        self.writes = 0
+
+    def write(self, text: str) -> int:
+        self.bytes += len(text.encode("utf-8"))
+        self.writes += 1
+
+        return len(text)
+
+    def writable(self) -> bool:
+        return True
+
+    def isatty(self) -> bool:
+        return False
+
+    def reset(self) -> tuple[int, int]:
+        """
+        Resets the counters and returns their values.
+
+        :return: The number of bytes and of write calls since the last reset.
+        """
+        counts = self.bytes, self.writes
+        self.bytes = self.writes = 0
+
+        return counts
+
+
+def _summarize(samples: list[float]) -> dict:
+    """
+    Summarizes durations in seconds as microseconds.
+    """
+    ordered = sorted(samples)
+
+    return {
+        "count": len(samples),
+        "mean_us": statistics.fmean(samples) * 1e6,
+        "median_us": statistics.median(samples) * 1e6,
+        "p95_us": ordered[int(0.95 * (len(ordered) - 1))] * 1e6,
+    }
+
+
+def bench_startup(stream: CountingStream) -> dict:
+    """
+    Cold start: from importing the game to the first complete cover frame.
+
+    The menu loop is replaced by one that draws the first frame and selects "Exit", so that the
+    measurement stops where the game would start waiting for a key.
+    """
+    start = time.perf_counter()
+
+    from game.game_controller import GameController
+    from ui.key_handler import KeyHandler
+
+    imported = time.perf_counter()
+    frame = {}
+
+    def register_menu(term, menu, default_option=0, on_enter=lambda x: None) -> int:
+        on_enter(default_option)
+        controller.ui.flush()
+        frame["time"] = time.perf_counter()
+
+        return len(menu) - 1
+
+    KeyHandler.register_menu = staticmethod(register_menu)
+
+    controller = GameController()
+    initialized = time.perf_counter()
+    stream.reset()
+
+    controller._GameController__render_cover()
+    cover_bytes, cover_writes = stream.reset()
+
+    return {
+        "import_s": imported - start,
+        "init_s": initialized - imported,
+        "first_cover_frame_s": frame["time"] - start,
+        "cover_bytes": cover_bytes,
+        "cover_writes": cover_writes,
+    }
+
+
+def bench_word_list(stream: CountingStream) -> dict:
+    """
+    Word list loading: parsing the text list, opening the compiled index as Wordle does, and loading
+    every bucket of it.
+    """
+    from config.config import config
+    from game.wordle import Wordle
+    from game.word_index import WordIndex
+
+    start = time.perf_counter()
+    words = sum(len(bucket) for bucket in WordIndex.parse(WORD_LIST).values())
+    parse_s = time.perf_counter() - start
+
+    # A Wordle reuses the index opened by the first one, so a fresh index is opened every time instead.
+    Wordle(WORD_LIST)
+    samples = []
+    for _ in range(20):
+        start = time.perf_counter()
+        index = WordIndex(WORD_LIST, config.get("MIN_WORD_LENGTH", 3), lazy=config.get("LAZY_WORD_LIST", True),
+                          cache_size=config.get("WORD_CACHE_SIZE", 2))
+        samples.append(time.perf_counter() - start)
+        index.close()
+
+    process_s = statistics.median(samples)
+
+    # A lazy open only reads the header, so the time to get at every word is that of a mapped open reading them all.
+    samples = []
+    for _ in range(20):
+        start = time.perf_counter()
+        index = WordIndex(WORD_LIST, config.get("MIN_WORD_LENGTH", 3))
+        for length in index.get_counts():
+            bytes(index.bucket(length).get_buffer())
+        samples.append(time.perf_counter() - start)
+        index.close()
+
+    load_s = statistics.median(samples)
+
+    return {
+        "words": words,
+        "parse_text_s": parse_s,
+        "parse_text_words_per_s": words / parse_s,
+        "process_file_s": process_s,
+        "load_file_s": load_s,
+    }
+
+
+def bench_check(stream: CountingStream, duration: float = 0.2) -> dict:
+    """
+    Wordle.check calls per second for each word length, with valid guesses drawn from the list.
+    """
+    from game.wordle import Wordle
+
+    game = Wordle(WORD_LIST)
+    index = game.get_word_list()
+    rng = random.Random(0)
+    results = {}
+
+    for length in sorted(index.get_counts()):
+        bucket = index.bucket(length)
+        guesses = [bucket[rng.randrange(len(bucket))].lower() for _ in range(1000)]
+        game.start(length)
+
+        calls = 0
+        start = time.perf_counter()
+        while time.perf_counter() - start < duration:
+            for guess in guesses:
+                game.check(guess)
+            calls += len(guesses)
+
+        results[str(length)] = calls / (time.perf_counter() - start)
+        game.end()
+
+    return {"calls_per_s": results}
+
+
+def bench_render(stream: CountingStream, length: int = 15, scrolls: int = 200) -> dict:
+    """
+    Board rendering: UI.append for every row of a game, then scrolling the display area, drawn on a
+    virtual screen that counts the bytes and escape sequences of each frame.
+    """
+    from colorama import Fore
+    from ui.backend import VirtualScreen
+    from ui.ui import UI
+
+    screen = VirtualScreen(COLUMNS, LINES)
+    ui = UI(screen)
+    rng = random.Random(0)
+    colors = (Fore.RED, Fore.YELLOW, Fore.GREEN)
+
+    ui.render_game_structure(length, "Player", "Information", "Shortcut")
+    ui.flush()
+    screen.reset_frames()
+
+    def measure(update) -> tuple[float, int, int]:
+        start = time.perf_counter()
+        update()
+        ui.flush()
+        elapsed = time.perf_counter() - start
+
+        frames = screen.reset_frames()
+        return (elapsed, sum(frame["bytes"] for frame in frames),
+                sum(sum(frame["sequences"].values()) for frame in frames))
+
+    appends = [measure(lambda: ui.append([{chr(rng.randrange(65, 91)): rng.choice(colors)} for _ in range(length)],
+                                         line))
+               for line in range(1, length + 2)]
+    scrolls = [measure(lambda: ui.scroll_display_area("up" if i % 2 == 0 else "down", 3)) for i in range(scrolls)]
+
+    def summarize(samples: list[tuple[float, int, int]]) -> dict:
+        return _summarize([elapsed for elapsed, _, _ in samples]) | {
+            "mean_bytes": statistics.fmean(size for _, size, _ in samples),
+            "mean_sequences": statistics.fmean(sequences for _, _, sequences in samples),
+        }
+
+    return {
+        "length": length,
+        "append": summarize(appends),
+        "scroll": summarize(scrolls),
+    }
+
+
+def bench_memory(stream: CountingStream) -> dict:
+    """
+    Growth of the resident memory, in bytes, when loading the word list in each layout, see `bench.memory`.
+    """
+    from bench import memory
+
+    return {f"{variant}_bytes": memory.measure(variant, 5) for variant in memory.VARIANTS}
+
+
+BENCHMARKS = {
+    "startup": bench_startup,
+    "word_list": bench_word_list,
+    "check": bench_check,
+    "render": bench_render,
+    "memory": bench_memory,
+}
+
+
+def run_child(name: str, output: Path) -> None:
+    """
+    Runs one benchmark in this process, with stdout counted and discarded.
+    """
+    stream = CountingStream()
+    sys.stdout = stream
+
+    try:
+        result = BENCHMARKS[name](stream)
+    finally:
+        sys.stdout = sys.__stdout__
+
+    output.write_text(json.dumps(result))
+
+
+def run_benchmarks(names: list[str]) -> dict:
+    """
+    Runs the given benchmarks, each in a fresh interpreter.
+
+    :param names: The benchmarks to run, keys of `BENCHMARKS`.
+    :return: The results, with the environment they were measured in under "meta".
+    """
+    from game.word_index import WordIndex
+
+    # Compile the word index up front, so that no benchmark measures a rebuild.
+    WordIndex(WORD_LIST).close()
+
+    results = {"meta": {
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "terminal": [COLUMNS, LINES],
+    }}
+
+    env = os.environ | {"COLUMNS": str(COLUMNS), "LINES": str(LINES)}
+    with tempfile.TemporaryDirectory() as directory:
+        for name in names:
+            output = Path(directory) / f"{name}.json"
+
+            start = time.perf_counter()
+            subprocess.run([sys.executable, "-m", "bench.suite", "--child", name, "--output", str(output)],
+                           cwd=ROOT, env=env, check=True, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL)
+            elapsed = time.perf_counter() - start
+
+            results[name] = json.loads(output.read_text())
+            if name == "startup":
+                results[name]["process_s"] = elapsed
+
+    return results
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("-o", "--output", type=Path, help="Write the results to this JSON file")
+    parser.add_argument("-b", "--benchmarks", nargs="+", choices=BENCHMARKS, default=list(BENCHMARKS),
+                        help="Benchmarks to run, all by default")
+
+
+def run(args: argparse.Namespace) -> None:
+    results = run_benchmarks(args.benchmarks)
+    text = json.dumps(results, indent=2)
+
+    if args.output:
+        args.output.write_text(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_arguments(parser)
+    parser.add_argument("--child", choices=BENCHMARKS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child, args.output)
+    else:
+        run(args)
@@ -0,0 +1,136 @@
+import weakref
+
+import numpy as np
+
+from .scoring import CORRECT, ABSENT, as_matrix, feedback_digits
+from .word_index import WordBucket
+
+
+class CandidateMasks:
+    """
+    Precomputed bitmasks over the words of a bucket, bit i standing for word i.
+
+    `position[i][c]` marks the words with letter c at position i, and `at_least[c][k]` the
+    words containing letter c at least k times. Any feedback can then be applied to a set of
+    candidates with a handful of bitwise operations on Python integers.
+    """
+
+    __cache = weakref.WeakKeyDictionary()
+
+    def __init__(self, bucket: WordBucket) -> None:
+        answers = as_matrix(bucket)
+        count, length = answers.shape
+
+        self.count = count
+        self.all = (1 << count) - 1
+        self.position = [[self.__to_mask(answers[:, i] == letter) for letter in range(26)] for i in range(length)]
+
+        occurrences = np.zeros((count, 26), dtype=np.uint8)
+        for i in range(length):
+            occurrences[np.arange(count), answers[:, i]] += 1
+
+        self.at_least = [
+            [self.all] + [self.__to_mask(occurrences[:, letter] >= k) for k in range(1, length + 1)]
+            for letter in range(26)
+        ]
+
+    @staticmethod
+    def __to_mask(selected: np.ndarray) -> int:
+        return int.from_bytes(np.packbits(selected, bitorder="little").tobytes(), "little")
+
+    @classmethod
+    def for_bucket(cls, bucket: WordBucket) -> "CandidateMasks":
+        """
+        Returns the masks of a bucket, computing them the first time the bucket is seen.
+
+        :param bucket: The bucket of words.
+        :return: The masks, shared by every candidate set over that bucket.
+        """
+        masks = cls.__cache.get(bucket)
+
+        if masks is None:
+            masks = cls.__cache[bucket] = cls(bucket)
+
+        return masks
+
+
+class CandidateSet:
+    """
+    The answers of a bucket that are still possible after the guesses of a game, as a bitmap.
+
+    Each guess narrows the bitmap with bitwise ANDs against the precomputed masks of the bucket
+    instead of rescoring every remaining word, so the cost of a guess does not grow with the
+    number of guesses already made.
+    """
+
+    def __init__(self, bucket: WordBucket) -> None:
+        self.__bucket = bucket
+        self.__masks = CandidateMasks.for_bucket(bucket)
+        self.__bits = self.__masks.all
+        # The number of guesses of the history already applied to the bitmap.
+        self.__applied = 0
+
+    def narrow(self, guess: bytes, code: int) -> None:
+        """
+        Keeps only the answers for which the guess would have produced the given feedback.
+
+        :param guess: The letter codes of the guess.
+        :param code: The feedback code of the guess, see `game.scoring.score`.
+        """
+        masks = self.__masks
+        bits = self.__bits
+        # Per letter: the number of times it was found, and whether that number is exact.
+        found = {}
+        exact = set()
+
+        for i, digit in enumerate(feedback_digits(code, len(guess))):
+            letter = guess[i]
+
+            if digit == CORRECT:
+                bits &= masks.position[i][letter]
+            else:
+                bits &= ~masks.position[i][letter]
+
+            if digit == ABSENT:
+                exact.add(letter)
+            else:
+                found[letter] = found.get(letter, 0) + 1
+
+        for letter in set(guess):
+            times = found.get(letter, 0)
+            bits &= masks.at_least[letter][times]
+
+            if letter in exact and times + 1 < len(masks.at_least[letter]):
+                bits &= ~masks.at_least[letter][times + 1]
+
+        self.__bits = bits
+
+    def update(self, history: list[tuple[str, int]]) -> None:
+        """
+        Narrows the candidates with the guesses of the history that were not applied yet.
+
+        :param history: Every guess of the game so far with its feedback code, oldest first.
+        """
+        for word, code in history[self.__applied:]:
+            self.narrow(self.__bucket.codes(self.__bucket.index(word)), code)
+
+        self.__applied = len(history)
+
+    def __len__(self) -> int:
+        return self.__bits.bit_count()
+
+    def __contains__(self, index: int) -> bool:
+        return bool(self.__bits >> index & 1)
+
+    def indices(self) -> np.ndarray:
+        """
+        Returns the bucket indices of the remaining candidates, in ascending order.
+
+        :return: An array of word indices.
+        """
+        data = np.frombuffer(self.__bits.to_bytes((self.__masks.count + 7) // 8, "little"), dtype=np.uint8)
+
+        return np.flatnonzero(np.unpackbits(data, count=self.__masks.count, bitorder="little"))
+
+    def words(self) -> list[str]:
+        return [self.__bucket[i] for i in self.indices()]
@@ -1,7 +1,11 @@
 import config.config as config
 
 from ui.ui import UI
+from ui.backend import Backend
+from ui.keymap import Keymap
 from game.wordle import Wordle
+from game.solver import Solver
+from game.candidates import CandidateSet
 from utils.utils import *
 from error import LengthNotExist, LetterNotExist
 from .menu_enum import *
@@ -9,30 +13,39 @@ from lang.language import lang
 
 
 class GameController:
-    def __init__(self):
-        self.ui = UI()
+    def __init__(self, backend: Backend | None = None):
+        """
+        :param backend: The terminal the game is played on, the real one by default.
+        """
+        self.ui = UI(backend)
         self.ui.set_banner(get_resource_path(f"{RESOURCES_PATH}/banner.txt"))
         self.game = Wordle(get_resource_path("word_list.txt"))
+        self.candidates = None
+        self.solver = None
         self.__state = self.__render_cover
 
     def run(self):
-        while True:
-            command = self.__state()
-
-            match command:
-                case '#cover':
-                    self.__state = self.__render_cover
-                case '#start':
-                    self.__state = self.__render_form
-                case '#options':
-                    self.__state = lambda: self.__render_options(MenuEnum.options_menu(), 0)
-                case '#language':
-                    self.__state = lambda: self.__render_options(
-                        lang.build_option_menu() + MenuEnum.options_language_menu(), lang.find_key_index()
-                    )
-                case '/exit':
-                    print("\n\n")
-                    break
+        self.ui.open_screen()
+
+        try:
+            while True:
+                command = self.__state()
+
+                match command:
+                    case '#cover':
+                        self.__state = self.__render_cover
+                    case '#start':
+                        self.__state = self.__render_form
+                    case '#options':
+                        self.__state = lambda: self.__render_options(MenuEnum.options_menu(), 0)
+                    case '#language':
+                        self.__state = lambda: self.__render_options(
+                            lang.build_option_menu() + MenuEnum.options_language_menu(), lang.find_key_index()
+                        )
+                    case '/exit':
+                        break
+        finally:
+            self.ui.close_screen()
 
     def __render_cover(self) -> any:
         menu = MenuEnum.cover_menu()
@@ -92,6 +105,8 @@ class GameController:
     def __render_game(self) -> None:
         hotkey, input_tip, shortcut_tip = self.__build_game_hotkey()
         length = self.game.get_length()
+        self.candidates = CandidateSet(self.game.get_word_list().bucket(length))
+        self.solver = None
 
         self.ui.render_game_structure(
             length,
@@ -113,6 +128,10 @@ class GameController:
                 color_letter = self.game.check(letter)
                 self.game.reduce_chance()
                 self.ui.append(color_letter, length - self.game.get_chance() + 1)
+
+                self.candidates.update(self.game.get_history())
+                self.ui.set_information(format_string(lang.get("game.information.remaining"),
+                                                      f"{Fore.GREEN}{len(self.candidates)}{Fore.RESET}"))
             except (LengthNotExist, LetterNotExist) as e:
                 self.ui.set_information(str(e), "error")
                 continue
@@ -138,45 +157,49 @@ class GameController:
         self.__state = self.__render_cover
         return None
 
-    def __build_game_hotkey(self) -> tuple[list[Dict[str, any]], str, str]:
-        hotkey = [
-            {
-                "key": "q",
-                "condition": lambda key: key == "q",
-                "description": lang.get("game.input.hotkey.exit"),
-                "func": lambda: '/exit'
-            },
-            {
-                "key": "↑↓",
-                "condition": lambda key: repr(key) == "KEY_UP",
-                "description": lang.get("game.input.hotkey.scroll"),
-                "func": lambda: self.ui.scroll_display_area('up', 2)
-            },
-            {
-                "key": "",
-                "condition": lambda key: repr(key) == "KEY_DOWN",
-                "description": "",
-                "func": lambda: self.ui.scroll_display_area('down', 2)
-            }
-        ]
+    def __build_game_hotkey(self) -> tuple[Keymap, str, str]:
+        hotkey = (Keymap()
+                  .bind("q", lambda: '/exit', "q", lang.get("game.input.hotkey.exit"))
+                  .bind("KEY_UP", lambda: self.ui.scroll_display_area('up', 2), "↑↓",
+                        lang.get("game.input.hotkey.scroll"))
+                  .bind("KEY_DOWN", lambda: self.ui.scroll_display_area('down', 2))
+                  .bind("h", self.__show_hint, "h", lang.get("game.input.hotkey.hint")))
 
         if config.DEBUG:
-            hotkey.append({
-                "key": "g",
-                "condition": lambda key: key == "g",
-                "description": lang.get("debug.game.input.hotkey.get_word"),
-                "func": lambda: self.ui.set_information(
+            hotkey = hotkey.layer(Keymap().bind(
+                "g",
+                lambda: self.ui.set_information(
                     format_string(lang.get("debug.game.information.get_word"), f"{Fore.GREEN}{self.game.get_word()}"),
-                    "debug")
-            })
+                    "debug"),
+                "g", lang.get("debug.game.input.hotkey.get_word")
+            ))
 
         tip_1 = format_string(lang.get("game.input.hotkey.tip"), hotkey_style('esc'), hotkey_style('enter'))
         tip_2 = (f"{lang.get('game.input.hotkey.tip.press')} "
                  + f"{hotkey_style('e')} {lang.get('game.input.hotkey.tip.start_editing')}, "
                  + ', '.join(
-                    f"{hotkey_style(hk['key'])} {hk['description']}"
-                    for hk in hotkey
-                    if hk['key'] != ''
+                    f"{hotkey_style(label)} {description}"
+                    for label, description in hotkey.labels()
                 ) + ".")
 
         return hotkey, tip_1, tip_2
+
+    def __show_hint(self) -> None:
+        if self.solver is None:
+            # A seeded game gives its hints a seed of their own, so that a replayed session gets the same ones.
+            seed = self.game.get_seed()
+            if seed is not None:
+                # Masked, as numpy only takes non-negative seeds and any integer seeds a game.
+                seed = [seed & (2 ** 64 - 1), *self.game.get_word().encode("ascii")]
+
+            self.solver = Solver(self.game.get_word_list(), self.game.get_length(), self.candidates, seed=seed)
+
+        self.solver.update(self.game.get_history())
+        guess = self.solver.best_guess()
+
+        if guess is None:
+            return
+
+        self.ui.set_information(
+            format_string(lang.get("game.information.hint"), f"{Fore.GREEN}{guess}{Fore.RESET}",
+                          self.solver.get_remaining()))
@@ -0,0 +1,162 @@
+import hashlib
+import os
+
+import numpy as np
+
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from .scoring import as_matrix, code_dtype, score_matrix
+from .word_index import WordIndex
+
+# Below this many guess/answer pairs, starting worker processes costs more than it saves.
+_PARALLEL_THRESHOLD = 4_000_000
+# The number of guess rows scored by a worker per task.
+_CHUNK_ROWS = 256
+
+# State of a worker process, set once by `_init_worker`.
+_worker = {}
+
+
+def _pattern_dtype(length: int) -> np.dtype:
+    """
+    Returns the smallest unsigned type that holds every feedback code of the given length.
+    """
+    if 3 ** length <= 2 ** 8:
+        return np.dtype(np.uint8)
+    if 3 ** length <= 2 ** 16:
+        return np.dtype(np.uint16)
+
+    return code_dtype(length)
+
+
+def _init_worker(source_path: Path, min_word_length: int, length: int, matrix_path: Path) -> None:
+    # The compiled index is memory-mapped, so workers share the word data through the page cache.
+    index = WordIndex(source_path, min_word_length)
+
+    _worker["index"] = index
+    _worker["answers"] = as_matrix(index.bucket(length))
+    _worker["matrix"] = np.load(matrix_path, mmap_mode="r+")
+
+
+def _fill_rows(start: int, stop: int) -> int:
+    """
+    Scores the guesses of rows [start, stop) against every answer and writes them to the matrix.
+
+    :return: The number of rows written.
+    """
+    answers, matrix = _worker["answers"], _worker["matrix"]
+
+    for row in range(start, stop):
+        matrix[row] = score_matrix(answers[row].tobytes(), answers)
+
+    matrix.flush()
+
+    return stop - start
+
+
+class PatternMatrix:
+    """
+    The feedback code of every guess against every answer among the words of one length.
+
+    Row i, column j holds `game.scoring.score(word i, word j)`, in bucket order. The matrix is
+    built once, in parallel across processes, and saved as a `.npy` file named after a hash of
+    the bucket, so a changed word list gets a new file instead of a stale one. Later runs only
+    memory-map that file, the first time the matrix is asked for.
+
+    The file takes count² × 1, 2 or 4 bytes depending on the length: about 160 MiB for five
+    letter words and several GiB for the largest buckets.
+    """
+
+    def __init__(self, index: WordIndex, length: int, cache_dir: str | Path | None = None,
+                 workers: int | None = None) -> None:
+        """
+        :param index: The word index to take the words from.
+        :param length: The word length.
+        :param cache_dir: The directory of the matrix files, by default `cache` next to the word list.
+        :param workers: The number of worker processes used to build the matrix, by default one per core.
+        """
+        self.__index = index
+        self.__length = length
+        self.__bucket = index.bucket(length)
+        self.__cache_dir = Path(cache_dir) if cache_dir is not None \
+            else index.get_source_path().parent / "cache"
+        self.__workers = workers or os.cpu_count() or 1
+
+        self.__digest = hashlib.blake2b(self.__bucket.get_buffer(), digest_size=8).hexdigest()
+        self.__matrix = None
+
+    def get_path(self) -> Path:
+        return self.__cache_dir / f"patterns_{self.__length}_{self.__digest}.npy"
+
+    def get_length(self) -> int:
+        return self.__length
+
+    def is_built(self) -> bool:
+        return self.get_path().exists()
+
+    def build(self) -> None:
+        """
+        Computes the whole matrix and saves it, replacing any existing file for the same words.
+        """
+        count = len(self.__bucket)
+        path = self.get_path()
+        temp_path = path.with_name(f"{path.stem}.{os.getpid()}.tmp.npy")
+
+        self.__cache_dir.mkdir(parents=True, exist_ok=True)
+        matrix = np.lib.format.open_memmap(temp_path, mode="w+", dtype=_pattern_dtype(self.__length),
+                                           shape=(count, count))
+
+        try:
+            if count * count < _PARALLEL_THRESHOLD or self.__workers == 1:
+                answers = as_matrix(self.__bucket)
+
+                for row in range(count):
+                    matrix[row] = score_matrix(answers[row].tobytes(), answers)
+
+                matrix.flush()
+            else:
+                matrix.flush()
+                self.__build_parallel(count, temp_path)
+
+            del matrix
+            os.replace(temp_path, path)
+        except BaseException:
+            del matrix
+            temp_path.unlink(missing_ok=True)
+            raise
+
+        self.__matrix = None
+
+    def __build_parallel(self, count: int, temp_path: Path) -> None:
+        init_args = (self.__index.get_source_path(), self.__index.get_min_word_length(), self.__length, temp_path)
+
+        with ProcessPoolExecutor(self.__workers, initializer=_init_worker, initargs=init_args) as executor:
+            starts = range(0, count, _CHUNK_ROWS)
+            stops = (min(start + _CHUNK_ROWS, count) for start in starts)
+
+            for _ in executor.map(_fill_rows, starts, stops):
+                pass
+
+    def matrix(self) -> np.ndarray:
+        """
+        Returns the read-only matrix, memory-mapping its file and building it first if needed.
+
+        :return: A (count, count) array of feedback codes, guesses along the rows.
+        """
+        if self.__matrix is None:
+            if not self.is_built():
+                self.build()
+
+            self.__matrix = np.load(self.get_path(), mmap_mode="r")
+
+        return self.__matrix
+
+    def row(self, guess: int) -> np.ndarray:
+        """
+        Returns the feedback codes of one guess against every answer.
+
+        :param guess: The bucket index of the guess.
+        :return: The row of the matrix for that guess.
+        """
+        return self.matrix()[guess]
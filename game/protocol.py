@@ -0,0 +1,174 @@
+"""
+The line protocol games are played over by programs: one JSON object per line in each direction.
+
+Requests have an "op" and its arguments:
+    {"op": "start", "length": 5}
+    {"op": "guess", "word": "crane"}
+    {"op": "state"}
+
+Every reply has "ok", and "error" when it is false. A request may carry an "id", which is copied
+into its reply so that a client can send several requests before reading the replies.
+    {"ok": true, "length": 5, "chances": 6}
+    {"ok": true, "word": "CRANE", "feedback": [0, 2, 1, 0, 0], "code": 15, "chances": 5, "won": false, "over": false}
+    {"ok": false, "error": "The 'XQZTV' you entered is not in the word list."}
+
+The feedback has one digit per letter, 0 for absent, 1 for present and 2 for correct, and the code
+packs them in base 3 (see `game.scoring.score`). Once a game is over, the reply of its last guess
+also gives the answer.
+
+Besides the game server (see `game.server`), a single game is played over stdin and stdout with:
+
+    python main.py --protocol < requests.jsonl
+"""
+import json
+import sys
+
+from pathlib import Path
+from typing import BinaryIO
+
+from error import LengthNotExist, LetterNotExist
+from lang.language import lang
+from utils.utils import ANSI_ESCAPE, format_string
+from .scoring import feedback_digits
+from .wordle import Wordle
+
+# The most bytes read from the input at once.
+CHUNK_SIZE = 1 << 16
+
+# Built once rather than by every json.dumps call with non-default options.
+_ENCODER = json.JSONEncoder(separators=(",", ":"))
+
+
+def _error(message: str) -> dict:
+    # The messages are shared with the terminal UI, which colors the words in them.
+    return {"ok": False, "error": ANSI_ESCAPE.sub("", message)}
+
+
+def _start(game: Wordle, request: dict) -> dict:
+    length = request.get("length")
+
+    if not isinstance(length, int) or isinstance(length, bool):
+        return _error(lang.get("protocol.error.invalid_length"))
+
+    game.start(length)
+
+    return {"ok": True, "length": game.get_length(), "chances": game.get_chance()}
+
+
+def _guess(game: Wordle, request: dict) -> dict:
+    word = request.get("word")
+
+    if not isinstance(word, str):
+        return _error(lang.get("protocol.error.invalid_word"))
+    if not game.get_length():
+        return _error(lang.get("protocol.error.no_game"))
+    if game.get_chance() <= 0 or game.get_win_status():
+        return _error(lang.get("protocol.error.game_over"))
+
+    code = game.check_code(word)
+    game.reduce_chance()
+
+    over = game.get_chance() <= 0 or game.get_win_status()
+    reply = {"ok": True, "word": word.upper(), "feedback": feedback_digits(code, len(word)), "code": code,
+             "chances": game.get_chance(), "won": game.get_win_status(), "over": over}
+
+    if over:
+        reply["answer"] = game.get_word()
+
+    return reply
+
+
+def _state(game: Wordle, request: dict) -> dict:
+    length = game.get_length()
+
+    return {"ok": True, "active": bool(length) and game.get_chance() > 0 and not game.get_win_status(),
+            "length": length, "chances": game.get_chance(), "won": game.get_win_status(),
+            "history": [{"word": word, "code": code} for word, code in game.get_history()]}
+
+
+OPERATIONS = {
+    "start": _start,
+    "guess": _guess,
+    "state": _state,
+}
+
+
+def handle(game: Wordle, request: any) -> dict:
+    """
+    Runs a request against the game of a client.
+
+    :param game: The game of the client sending the request.
+    :param request: The decoded request.
+    :return: The reply, an error reply if the request could not be carried out.
+    """
+    if not isinstance(request, dict):
+        return _error(lang.get("protocol.error.invalid_request"))
+
+    op = request.get("op")
+    operation = OPERATIONS.get(op) if isinstance(op, str) else None
+
+    if operation is None:
+        reply = _error(format_string(lang.get("protocol.error.unknown_op"), op))
+    else:
+        try:
+            reply = operation(game, request)
+        except (LengthNotExist, LetterNotExist) as e:
+            reply = _error(str(e))
+
+    if "id" in request:
+        reply["id"] = request["id"]
+
+    return reply
+
+
+def handle_line(game: Wordle, line: str | bytes) -> str:
+    """
+    Runs a request line against the game of a client.
+
+    :param game: The game of the client sending the request.
+    :param line: The JSON request, with or without its line break.
+    :return: The JSON reply, without a line break.
+    """
+    try:
+        request = json.loads(line)
+    except (ValueError, RecursionError):
+        # Not JSON, or nested too deeply for the decoder.
+        request = None
+
+    return _ENCODER.encode(handle(game, request))
+
+
+def serve_stream(game: Wordle, source: BinaryIO, sink: BinaryIO) -> None:
+    """
+    Runs the request lines read from a stream until its end, writing the replies to another.
+
+    The input is read a chunk at a time, as much as is available, and the replies to the whole
+    lines of a chunk are written and flushed together. A program piping many requests at once
+    gets its replies in large writes, while one waiting for each reply gets it right away.
+
+    :param game: The game the requests are played on.
+    :param source: The binary stream the requests are read from.
+    :param sink: The binary stream the replies are written to.
+    """
+    read = getattr(source, "read1", source.read)
+    rest = b""
+
+    while chunk := read(CHUNK_SIZE):
+        *lines, rest = (rest + chunk).split(b"\n")
+        replies = [handle_line(game, line) for line in lines if line.strip()]
+
+        if replies:
+            sink.write(("\n".join(replies) + "\n").encode("utf-8"))
+            sink.flush()
+
+    # The last request may not end with a line break.
+    if rest.strip():
+        sink.write((handle_line(game, rest) + "\n").encode("utf-8"))
+        sink.flush()
+
+
+def run(word_list: str | Path) -> None:
+    try:
+        serve_stream(Wordle(word_list), sys.stdin.buffer, sys.stdout.buffer)
+    except (BrokenPipeError, KeyboardInterrupt):
+        pass
@@ -0,0 +1,187 @@
+"""
+Records the keys of interactive sessions, and replays them headless as fast as possible.
+
+    python main.py record session.keys
+    python main.py replay sessions/ --repeat 10 -o results.json
+
+A recording is a text file: a header line with the format, the seed of the words and the terminal
+size, then one key per line, either a key name ("KEY_ENTER", see `ui.keymap.key_name`) or the
+character typed. Replaying feeds the keys to a `GameController` drawing on a virtual screen of the
+recorded size, with the words seeded as recorded, so that a session always produces the same frames.
+"""
+import argparse
+import json
+import random
+import time
+
+from pathlib import Path
+from typing import NamedTuple
+
+from ui.backend import Backend, TerminalBackend, VirtualScreen
+from ui.keymap import key_name
+
+FORMAT = "PYWORDLE-KEYS"
+VERSION = 1
+SUFFIX = ".keys"
+
+
+class Recording(NamedTuple):
+    seed: int
+    # The terminal size as (columns, lines).
+    size: tuple[int, int]
+    keys: list[str]
+
+    def save(self, path: str | Path) -> None:
+        columns, lines = self.size
+        header = f"{FORMAT} {VERSION} {self.seed} {columns}x{lines}"
+
+        Path(path).write_text("\n".join([header, *self.keys]) + "\n", encoding="utf-8")
+
+    @staticmethod
+    def load(path: str | Path) -> "Recording":
+        """
+        :raises ValueError: If the file is not a recording of a supported version.
+        """
+        header, *keys = Path(path).read_text(encoding="utf-8").split("\n")
+        parts = header.split()
+
+        if len(parts) != 4 or parts[0] != FORMAT or parts[1] != str(VERSION):
+            raise ValueError(f"'{path}' is not a {FORMAT} {VERSION} recording.")
+
+        columns, lines = parts[3].split("x")
+
+        # The file ends with a line break, and a typed space is a line of its own.
+        return Recording(int(parts[2]), (int(columns), int(lines)), keys[:-1] if keys and keys[-1] == "" else keys)
+
+
+class RecordingKeyboard:
+    """
+    Wraps a keyboard, keeping the name of every key read from it.
+    """
+
+    def __init__(self, keyboard: any) -> None:
+        self.__keyboard = keyboard
+        self.keys = []
+
+    def inkey(self, *args, **kwargs):
+        key = self.__keyboard.inkey(*args, **kwargs)
+
+        if key:
+            self.keys.append(key_name(key))
+
+        return key
+
+    def __getattr__(self, name: str) -> any:
+        return getattr(self.__keyboard, name)
+
+
+class RecordingBackend(Backend):
+    """
+    Wraps a backend, recording the keys read from its keyboard.
+    """
+
+    def __init__(self, backend: Backend) -> None:
+        self.__backend = backend
+        self.__keyboard = RecordingKeyboard(backend.get_keyboard())
+
+    def write(self, text: str) -> None:
+        self.__backend.write(text)
+
+    def flush(self) -> None:
+        self.__backend.flush()
+
+    def get_size(self) -> tuple[int, int]:
+        return self.__backend.get_size()
+
+    def get_keyboard(self) -> RecordingKeyboard:
+        return self.__keyboard
+
+    def get_keys(self) -> list[str]:
+        return self.__keyboard.keys
+
+
+def replay(recording: Recording) -> dict:
+    """
+    Plays a recorded session on a virtual screen, without waiting between the keys.
+
+    :param recording: The session to play.
+    :return: The time taken, and the keys read, frames drawn and bytes written.
+    """
+    # Imported here, as the game controller pulls in the whole UI.
+    from game.game_controller import GameController
+
+    screen = VirtualScreen(*recording.size)
+    screen.get_keyboard().feed(*recording.keys)
+
+    start = time.perf_counter()
+    game = GameController(screen)
+    game.game.seed(recording.seed)
+
+    try:
+        game.run()
+    except EOFError:
+        # The recording ended before the session did.
+        pass
+
+    elapsed = time.perf_counter() - start
+    frames = screen.get_frames()
+
+    return {
+        "time_s": elapsed,
+        "keys": len(recording.keys) - screen.get_keyboard().pending(),
+        "frames": len(frames),
+        "bytes": sum(frame["bytes"] for frame in frames),
+    }
+
+
+def add_record_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("output", type=Path, help="The file to record the session to")
+    parser.add_argument("--seed", type=int, default=None, help="Seed of the words, random by default")
+
+
+def add_replay_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("recordings", type=Path, nargs="+",
+                        help=f"Recordings to replay, or directories of {SUFFIX} recordings")
+    parser.add_argument("-r", "--repeat", type=int, default=1, help="Number of times every recording is replayed")
+    parser.add_argument("-o", "--output", type=Path, help="Write the results to this JSON file")
+
+
+def record(args: argparse.Namespace) -> None:
+    from game.game_controller import GameController
+
+    seed = args.seed if args.seed is not None else random.getrandbits(32)
+    backend = RecordingBackend(TerminalBackend())
+
+    game = GameController(backend)
+    game.game.seed(seed)
+
+    try:
+        game.run()
+    finally:
+        Recording(seed, backend.get_size(), backend.get_keys()).save(args.output)
+
+
+def run_replay(args: argparse.Namespace) -> None:
+    paths = []
+    for path in args.recordings:
+        paths.extend(sorted(path.glob(f"*{SUFFIX}")) if path.is_dir() else [path])
+
+    try:
+        recordings = [Recording.load(path) for path in paths]
+    except (OSError, ValueError) as e:
+        raise SystemExit(str(e))
+
+    totals = {"sessions": 0, "time_s": 0.0, "keys": 0, "frames": 0, "bytes": 0}
+    for _ in range(args.repeat):
+        for recording in recordings:
+            totals["sessions"] += 1
+            for key, value in replay(recording).items():
+                totals[key] += value
+
+    totals["keys_per_s"] = totals["keys"] / totals["time_s"] if totals["time_s"] else 0.0
+    text = json.dumps(totals, indent=2)
+
+    if args.output:
+        args.output.write_text(text + "\n")
+    else:
+        print(text)
@@ -0,0 +1,141 @@
+import numpy as np
+
+from functools import lru_cache
+
+# Feedback of a single position, stored as one base-3 digit of the feedback code.
+ABSENT = 0
+PRESENT = 1
+CORRECT = 2
+
+
+def code_dtype(length: int) -> np.dtype:
+    """
+    Returns the type of the feedback codes of `score_matrix` for words of the given length: 32 bits
+    up to 20 letters, 64 bits up to `game.word_index.MAX_WORD_LENGTH` letters.
+    """
+    return np.dtype(np.uint32 if 3 ** length <= 2 ** 32 else np.uint64)
+
+
+@lru_cache(maxsize=64)
+def _weights(length: int) -> np.ndarray:
+    """
+    Returns the weight of the digit of each position, the first letter being the least significant.
+    """
+    return 3 ** np.arange(length, dtype=code_dtype(length))
+
+
+def score(guess: bytes, answer: bytes) -> int:
+    """
+    Scores a guess against an answer and returns the feedback as a base-3 code.
+
+    Digit i of the code (weight 3 ** i) is the feedback of position i: CORRECT when the letters
+    match, PRESENT when the guessed letter appears at an unmatched position of the answer,
+    ABSENT otherwise. A letter guessed more times than it is left unmatched in the answer is only
+    PRESENT for as many occurrences as are left, from left to right.
+
+    :param guess: The letter codes of the guess.
+    :param answer: The letter codes of the answer, of the same length as the guess.
+    :return: The feedback code.
+    """
+    length = len(guess)
+    digits = [ABSENT] * length
+
+    # Count the letters of the answer that are not matched exactly.
+    available = {}
+    for i in range(length):
+        if guess[i] == answer[i]:
+            digits[i] = CORRECT
+        else:
+            available[answer[i]] = available.get(answer[i], 0) + 1
+
+    for i in range(length):
+        if digits[i] == CORRECT:
+            continue
+
+        letter = guess[i]
+        if available.get(letter, 0) > 0:
+            digits[i] = PRESENT
+            available[letter] -= 1
+
+    code = 0
+    for digit in reversed(digits):
+        code = code * 3 + digit
+
+    return code
+
+
+def score_matrix(guess: bytes, answers: np.ndarray) -> np.ndarray:
+    """
+    Scores a guess against many answers at once, following the same rules as `score`.
+
+    :param guess: The letter codes of the guess.
+    :param answers: A (count, length) uint8 matrix of answer letter codes, see `as_matrix`.
+    :return: An array holding the feedback code of each answer, of type `code_dtype(length)`.
+    """
+    length = len(guess)
+    guess = np.frombuffer(guess, dtype=np.uint8)
+    weights = _weights(length)
+
+    correct = answers == guess
+    unmatched = ~correct
+    codes = (correct @ weights) * CORRECT
+
+    for letter in np.unique(guess):
+        # Occurrences of the letter at the unmatched positions of each answer.
+        available = ((answers == letter) & unmatched).sum(axis=1, dtype=np.int8)
+
+        for i in np.flatnonzero(guess == letter):
+            present = unmatched[:, i] & (available > 0)
+            available -= present
+            codes += present * weights[i]
+
+    return codes
+
+
+def as_matrix(bucket) -> np.ndarray:
+    """
+    Views the words of a bucket as a (count, length) uint8 matrix of letter codes, without copying.
+
+    :param bucket: A `game.word_index.WordBucket`.
+    :return: The read-only matrix of letter codes.
+    """
+    return np.frombuffer(bucket.get_buffer(), dtype=np.uint8).reshape(len(bucket), bucket.get_length())
+
+
+def score_bucket(guess: bytes, bucket) -> np.ndarray:
+    """
+    Scores a guess against every word of a bucket in a single call.
+
+    :param guess: The letter codes of the guess.
+    :param bucket: A `game.word_index.WordBucket` of words of the same length as the guess.
+    :return: An array holding the feedback code of each word of the bucket, in bucket order, of type
+             `code_dtype(length)`.
+    """
+    return score_matrix(guess, as_matrix(bucket))
+
+
+def solved_code(length: int) -> int:
+    """
+    Returns the feedback code of a guess that matches the answer exactly.
+
+    :param length: The word length.
+    :return: The code with every digit set to CORRECT.
+    """
+    return 3 ** length - 1
+
+
+def feedback_digits(code: int, length: int) -> list[int]:
+    """
+    Splits a feedback code into the feedback of each position.
+
+    :param code: The feedback code.
+    :param length: The word length.
+    :return: A list of ABSENT, PRESENT or CORRECT, one per position.
+    """
+    digits = []
+
+    for _ in range(length):
+        code, digit = divmod(code, 3)
+        digits.append(digit)
+
+    return digits
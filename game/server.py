@@ -0,0 +1,223 @@
+"""
+Serves games to many clients at once over TCP, with the line protocol of `game.protocol`.
+
+    python main.py serve --port 8765
+    python main.py serve --port 8765 --workers 8
+
+Every connection plays its own game, all of them drawing their words from one word index opened
+by the server, and they are all handled by a single asyncio event loop. With several workers, the
+server opens the index and the listening socket, then forks processes that each run an event loop
+accepting from the socket, their games reading the words from the pages of the mapped index that
+the processes share.
+"""
+import argparse
+import asyncio
+import os
+import signal
+import socket
+
+from pathlib import Path
+
+from config.config import config
+from .protocol import handle_line
+from .wordle import Wordle
+from .word_index import WordIndex, shared_index
+
+# The longest request line accepted, a client sending a longer one is disconnected.
+LINE_LIMIT = 4096
+
+
+class GameServer:
+    """
+    An asyncio TCP server giving each connection a game of its own.
+
+    The word index is opened once, with every bucket mapped, and shared by the games, which only
+    keep their own word, chances and guesses. A request is handled as soon as its line is read, and
+    its reply is written before the next line of the connection is read.
+    """
+
+    def __init__(self, word_list: str | Path | WordIndex, host: str = "127.0.0.1", port: int = 8765,
+                 backlog: int = 1024) -> None:
+        """
+        :param word_list: The path to the text word list, or an index already opened.
+        :param host: The address to listen on.
+        :param port: The port to listen on, 0 for any free port.
+        :param backlog: The number of connections waiting to be accepted the system may queue.
+        """
+        if not isinstance(word_list, WordIndex):
+            word_list = shared_index(word_list, config.get("MIN_WORD_LENGTH", 3))
+
+        self.__index = word_list
+        self.__host = host
+        self.__port = port
+        self.__backlog = backlog
+        self.__socket = None
+        self.__server = None
+        self.__sessions = 0
+
+    def get_index(self) -> WordIndex:
+        return self.__index
+
+    def get_session_count(self) -> int:
+        """
+        :return: The number of clients currently connected.
+        """
+        return self.__sessions
+
+    def get_address(self) -> tuple[str, int]:
+        """
+        :return: The address the server listens on, once bound or started.
+        """
+        sock = self.__socket if self.__socket is not None else self.__server.sockets[0]
+
+        return sock.getsockname()[:2]
+
+    def bind(self) -> None:
+        """
+        Opens the listening socket ahead of `start`, so that the processes forked afterwards all
+        accept the connections from it.
+        """
+        self.__socket = socket.create_server((self.__host, self.__port), backlog=self.__backlog)
+        self.__socket.setblocking(False)
+
+    async def start(self) -> None:
+        if self.__socket is not None:
+            self.__server = await asyncio.start_server(self.__serve_client, sock=self.__socket,
+                                                       backlog=self.__backlog, limit=LINE_LIMIT)
+        else:
+            self.__server = await asyncio.start_server(self.__serve_client, self.__host, self.__port,
+                                                       backlog=self.__backlog, limit=LINE_LIMIT)
+
+    async def serve_forever(self) -> None:
+        if self.__server is None:
+            await self.start()
+
+        async with self.__server:
+            await self.__server.serve_forever()
+
+    def serve_workers(self, workers: int) -> None:
+        """
+        Forks worker processes serving the games, and waits for them to exit.
+
+        The index has to be mapped rather than lazy, so that the workers share its pages instead of
+        each reading the buckets it plays. Every worker draws its words from a generator of its
+        own, as `random` reseeds itself in a forked child.
+
+        :param workers: The number of worker processes.
+        :raises OSError: If the platform cannot fork processes.
+        """
+        if not hasattr(os, "fork"):
+            raise OSError("Worker processes need os.fork, which this platform does not have.")
+
+        if self.__socket is None:
+            self.bind()
+
+        # Stopping the server stops the workers, whether by Ctrl+C or by a SIGTERM.
+        signal.signal(signal.SIGTERM, signal.default_int_handler)
+
+        children = []
+        for _ in range(workers):
+            pid = os.fork()
+
+            if pid == 0:
+                signal.signal(signal.SIGTERM, signal.SIG_DFL)
+
+                # A child never returns to the caller, whatever happens to its event loop.
+                status = 0
+                try:
+                    asyncio.run(self.serve_forever())
+                except KeyboardInterrupt:
+                    pass
+                except BaseException:
+                    status = 1
+                finally:
+                    os._exit(status)
+
+            children.append(pid)
+
+        # The workers own the socket now.
+        self.__socket.close()
+
+        try:
+            for pid in children:
+                os.waitpid(pid, 0)
+        except KeyboardInterrupt:
+            for pid in children:
+                try:
+                    os.kill(pid, signal.SIGTERM)
+                except ProcessLookupError:
+                    pass
+
+            for pid in children:
+                os.waitpid(pid, 0)
+
+    async def __serve_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        game = Wordle(self.__index)
+        self.__sessions += 1
+
+        try:
+            while line := await reader.readline():
+                if not line.strip():
+                    continue
+
+                writer.write(handle_line(game, line).encode("utf-8") + b"\n")
+                await writer.drain()
+        except (ConnectionError, ValueError):
+            # The client went away, or sent a line longer than LINE_LIMIT.
+            pass
+        finally:
+            self.__sessions -= 1
+            writer.close()
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on")
+    parser.add_argument("-p", "--port", type=int, default=8765, help="Port to listen on")
+    parser.add_argument("--backlog", type=int, default=1024, help="Connections the system may queue "
+                                                                   "before they are accepted")
+    parser.add_argument("-w", "--workers", type=int, default=1, help="Number of worker processes, "
+                                                                     "sharing the word index")
+
+
+def raise_file_limit() -> None:
+    # Every client holds a file descriptor, and the default soft limit is often as low as 1024.
+    try:
+        import resource
+    except ImportError:
+        return
+
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft != hard:
+        try:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+        except (ValueError, OSError):
+            pass
+
+
+def run(args: argparse.Namespace, word_list: str | Path) -> None:
+    raise_file_limit()
+    server = GameServer(word_list, args.host, args.port, args.backlog)
+
+    if args.workers > 1:
+        try:
+            server.bind()
+            host, port = server.get_address()
+            print(f"Serving games on {host}:{port}, {server.get_index().get_word_count()} words, "
+                  f"{args.workers} workers", flush=True)
+
+            server.serve_workers(args.workers)
+        except OSError as e:
+            raise SystemExit(str(e))
+        return
+
+    async def serve() -> None:
+        await server.start()
+        host, port = server.get_address()
+        print(f"Serving games on {host}:{port}, {server.get_index().get_word_count()} words", flush=True)
+
+        await server.serve_forever()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
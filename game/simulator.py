@@ -0,0 +1,243 @@
+import argparse
+import importlib
+import json
+import os
+import random
+
+from abc import ABC, abstractmethod
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from config.config import config
+from .candidates import CandidateSet
+from .solver import Solver
+from .wordle import Wordle
+from .word_index import WordIndex, shared_index
+
+
+class Strategy(ABC):
+    """
+    Base class of the guessing strategies played by the simulator.
+
+    A strategy is created for each game and asked for one guess at a time, given every guess
+    of the game so far with its feedback code.
+    """
+
+    def __init__(self, index: WordIndex, length: int, rng: random.Random) -> None:
+        self.index = index
+        self.length = length
+        self.rng = rng
+
+    @abstractmethod
+    def guess(self, history: list[tuple[str, int]]) -> str:
+        """
+        :param history: Every guess of the game so far with its feedback code, oldest first.
+        :return: The next guess.
+        """
+
+
+class RandomCandidateStrategy(Strategy):
+    """
+    Guesses a random word among those still consistent with the feedback.
+    """
+
+    def __init__(self, index: WordIndex, length: int, rng: random.Random) -> None:
+        super().__init__(index, length, rng)
+        self.bucket = index.bucket(length)
+        self.candidates = CandidateSet(self.bucket)
+
+    def guess(self, history: list[tuple[str, int]]) -> str:
+        self.candidates.update(history)
+        indices = self.candidates.indices()
+
+        return self.bucket[int(indices[self.rng.randrange(len(indices))])]
+
+
+class EntropyStrategy(Strategy):
+    """
+    Guesses the word suggested by the hint engine, with a short time limit per guess.
+    """
+
+    time_limit = 0.02
+
+    def __init__(self, index: WordIndex, length: int, rng: random.Random) -> None:
+        super().__init__(index, length, rng)
+        self.solver = Solver(index, length, time_limit=self.time_limit, seed=rng.getrandbits(32))
+
+    def guess(self, history: list[tuple[str, int]]) -> str:
+        self.solver.update(history)
+
+        return self.solver.best_guess()
+
+
+STRATEGIES = {
+    "random": RandomCandidateStrategy,
+    "entropy": EntropyStrategy,
+}
+
+
+def load_strategy(name: str) -> type[Strategy]:
+    """
+    Resolves a strategy by its name in `STRATEGIES`, or by a "module:Class" path to a `Strategy` subclass.
+
+    :param name: The strategy name or path.
+    :return: The strategy class.
+    :raises ValueError: If the strategy cannot be found.
+    """
+    if name in STRATEGIES:
+        return STRATEGIES[name]
+
+    module_name, _, class_name = name.partition(":")
+    try:
+        strategy = getattr(importlib.import_module(module_name), class_name)
+    except (ImportError, AttributeError, ValueError):
+        raise ValueError(f"Unknown strategy: '{name}'. Use one of {', '.join(STRATEGIES)} or 'module:Class'.")
+
+    if not (isinstance(strategy, type) and issubclass(strategy, Strategy)):
+        raise ValueError(f"'{name}' is not a Strategy subclass.")
+
+    return strategy
+
+
+# The game of a worker process, set once by `_init_worker`.
+_worker = {}
+
+
+def _init_worker(word_list: Path) -> None:
+    # Every worker maps the compiled index, which the parent has already brought up to date, so that
+    # the workers share its pages rather than each reading the buckets it plays.
+    _worker["game"] = Wordle(shared_index(word_list, config.get("MIN_WORD_LENGTH", 3), lazy=False))
+
+
+def _play_chunk(length: int, games: int, strategy_name: str, seed: int) -> tuple[int, Counter]:
+    """
+    Plays a chunk of games of one length in a worker process.
+
+    :return: The length and a counter of the games by number of guesses, 0 standing for a lost game.
+    """
+    game = _worker["game"]
+    strategy_class = load_strategy(strategy_name)
+    # The words and the guesses are drawn from generators of their own, both derived from the seed.
+    seeds = random.Random(seed)
+    game.seed(seeds.getrandbits(64))
+    rng = random.Random(seeds.getrandbits(64))
+
+    results = Counter()
+    for _ in range(games):
+        game.start(length)
+        strategy = strategy_class(game.get_word_list(), length, rng)
+
+        while game.get_chance() > 0 and not game.get_win_status():
+            game.check_code(strategy.guess(game.get_history()))
+            game.reduce_chance()
+
+        results[len(game.get_history()) if game.get_win_status() else 0] += 1
+        game.end()
+
+    return length, results
+
+
+class Simulator:
+    """
+    Plays games without a terminal, fanning them out over a pool of worker processes.
+    """
+
+    def __init__(self, word_list: str | Path, strategy: str = "random", workers: int | None = None,
+                 chunk_size: int = 500, seed: int = 0) -> None:
+        """
+        :param word_list: The path to the text word list.
+        :param strategy: The guessing strategy, see `load_strategy`.
+        :param workers: The number of worker processes, by default one per core.
+        :param chunk_size: The number of games played by a worker per task.
+        :param seed: The seed from which the seed of every chunk is derived.
+        """
+        # Fail early on an unknown strategy rather than in every worker.
+        load_strategy(strategy)
+
+        self.word_list = Path(word_list)
+        self.strategy = strategy
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = max(1, chunk_size)
+        self.seed = seed
+
+    def run(self, games: int, lengths: list[int]) -> dict[int, dict]:
+        """
+        Plays the given number of games of each length.
+
+        :param games: The number of games per length.
+        :param lengths: The word lengths to play.
+        :return: The statistics of each length: games, wins, win rate, average guesses of the
+                 won games and distribution of the number of guesses ("lost" for lost games).
+        :raises ValueError: If there are no words of one of the lengths.
+        """
+        # Compile the index once here, so that the workers only ever map it. It is closed rather than
+        # shared, so that no worker inherits an index opened by the parent.
+        index = WordIndex(self.word_list, config.get("MIN_WORD_LENGTH", 3))
+        missing = [length for length in lengths if length not in index]
+        bounds = index.get_min_length(), index.get_max_length()
+        index.close()
+
+        if missing:
+            raise ValueError(f"No words of length {', '.join(map(str, missing))} in the word list, the lengths "
+                             f"go from {bounds[0]} to {bounds[1]}.")
+
+        tasks = []
+        for length in lengths:
+            for start in range(0, games, self.chunk_size):
+                tasks.append((length, min(self.chunk_size, games - start), self.strategy, self.seed + len(tasks)))
+
+        totals = {length: Counter() for length in lengths}
+        with ProcessPoolExecutor(self.workers, initializer=_init_worker, initargs=(self.word_list,)) as executor:
+            for length, results in executor.map(_play_chunk, *zip(*tasks)):
+                totals[length].update(results)
+
+        return {length: self.__summarize(results) for length, results in totals.items()}
+
+    @staticmethod
+    def __summarize(results: Counter) -> dict:
+        games = sum(results.values())
+        lost = results.pop(0, 0)
+        wins = games - lost
+
+        distribution = {str(guesses): results[guesses] for guesses in sorted(results)}
+        distribution["lost"] = lost
+
+        return {
+            "games": games,
+            "wins": wins,
+            "win_rate": wins / games if games else 0.0,
+            "average_guesses": sum(guesses * count for guesses, count in results.items()) / wins if wins else None,
+            "distribution": distribution,
+        }
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("-n", "--games", type=int, default=1000, help="Number of games per length")
+    parser.add_argument("-l", "--lengths", type=int, nargs="+", default=[5], help="Word lengths to play")
+    parser.add_argument("-s", "--strategy", default="random",
+                        help=f"Guessing strategy: {', '.join(STRATEGIES)} or 'module:Class'")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Number of worker processes")
+    parser.add_argument("--chunk-size", type=int, default=500, help="Games played by a worker per task")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the simulation")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+
+
+def run(args: argparse.Namespace, word_list: str | Path) -> None:
+    try:
+        simulator = Simulator(word_list, args.strategy, args.workers, args.chunk_size, args.seed)
+        results = simulator.run(args.games, args.lengths)
+    except ValueError as e:
+        raise SystemExit(str(e))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    for length, stats in results.items():
+        average = f"{stats['average_guesses']:.2f}" if stats["average_guesses"] is not None else "-"
+        print(f"Length {length}: {stats['wins']}/{stats['games']} won ({stats['win_rate']:.1%}), "
+              f"{average} guesses on average")
+
+        for guesses, count in stats["distribution"].items():
+            print(f"  {guesses:>4} {count}")
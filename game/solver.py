@@ -0,0 +1,113 @@
+import time
+
+import numpy as np
+
+from .candidates import CandidateSet
+from .pattern_matrix import PatternMatrix
+from .scoring import as_matrix, score_matrix
+from .word_index import WordIndex
+
+
+class Solver:
+    """
+    Suggests the next guess of a game by expected information gain.
+
+    The answers that are still possible are tracked by a `CandidateSet`, narrowed with bitwise
+    operations as each new guess of the session comes in. Guesses are then ranked by the entropy
+    of the feedback they would produce over the remaining candidates, computed with the vectorized
+    kernel, or read from the pattern matrix when it has already been built for this length.
+    """
+
+    def __init__(self, index: WordIndex, length: int, candidates: CandidateSet | None = None,
+                 time_limit: float = 0.3, seed: int | list[int] | None = None) -> None:
+        """
+        :param index: The word index of the game.
+        :param length: The word length of the game.
+        :param candidates: The candidate set of the game, if it is already tracked elsewhere.
+        :param time_limit: The time in seconds after which `best_guess` returns the best guess found so far.
+        :param seed: The seed used to sample the guesses tried when not all of them fit in the time limit,
+                     anything `numpy.random.default_rng` accepts.
+        """
+        self.__bucket = index.bucket(length)
+        self.__answers = as_matrix(self.__bucket)
+        self.__time_limit = time_limit
+        self.__rng = np.random.default_rng(seed)
+
+        patterns = PatternMatrix(index, length)
+        self.__patterns = patterns if patterns.is_built() else None
+
+        self.__candidate_set = candidates if candidates is not None else CandidateSet(self.__bucket)
+        self.__candidates = self.__candidate_set.indices()
+        self.__candidate_answers = self.__answers[self.__candidates]
+
+    def update(self, history: list[tuple[str, int]]) -> None:
+        """
+        Narrows the candidates with the guesses of the history that were not applied yet.
+
+        :param history: Every guess of the session so far with its feedback code, oldest first.
+        """
+        self.__candidate_set.update(history)
+
+        if len(self.__candidate_set) != len(self.__candidates):
+            self.__candidates = self.__candidate_set.indices()
+            self.__candidate_answers = self.__answers[self.__candidates]
+
+    def get_remaining(self) -> int:
+        return len(self.__candidates)
+
+    def get_candidates(self) -> list[str]:
+        return [self.__bucket[i] for i in self.__candidates]
+
+    def __score(self, guess: int) -> np.ndarray:
+        """
+        Returns the feedback codes of a guess against each remaining candidate.
+
+        :param guess: The bucket index of the guess.
+        """
+        if self.__patterns is not None:
+            return self.__patterns.row(guess)[self.__candidates]
+
+        return score_matrix(self.__bucket.codes(guess), self.__candidate_answers)
+
+    @staticmethod
+    def __entropy(codes: np.ndarray) -> float:
+        _, counts = np.unique(codes, return_counts=True)
+        total = counts.sum()
+
+        return float(np.log2(total) - (counts * np.log2(counts)).sum() / total)
+
+    def best_guess(self) -> str | None:
+        """
+        Returns the guess that is expected to reveal the most about the answer.
+
+        Remaining candidates are tried first, as they may also win the game, then the rest of the
+        bucket, in random order, until the time limit is reached. The chance of a candidate being
+        the answer, 1 / remaining, is added to its gain, so that it wins ties.
+
+        :return: The suggested guess, or None if no answer matches the feedback so far.
+        """
+        remaining = len(self.__candidates)
+
+        if remaining <= 2:
+            return self.__bucket[self.__candidates[0]] if remaining else None
+
+        deadline = time.perf_counter() + self.__time_limit
+        others = np.setdiff1d(np.arange(len(self.__bucket)), self.__candidates, assume_unique=True)
+        pool = np.concatenate([self.__rng.permutation(self.__candidates), self.__rng.permutation(others)])
+
+        # A candidate that splits the others into singletons cannot be beaten.
+        max_gain = np.log2(remaining) + 1 / remaining
+
+        best, best_gain = pool[0], -1.0
+        for tried, guess in enumerate(pool):
+            gain = self.__entropy(self.__score(guess))
+            if tried < remaining:
+                gain += 1 / remaining
+
+            if gain > best_gain:
+                best, best_gain = guess, gain
+
+            if best_gain >= max_gain or time.perf_counter() > deadline:
+                break
+
+        return self.__bucket[best]
@@ -0,0 +1,469 @@
+import io
+import mmap
+import os
+import struct
+import threading
+
+from bisect import bisect_left
+from collections import OrderedDict
+from pathlib import Path
+
+# Compiled word list layout (little-endian):
+#   header : magic, format version, MIN_WORD_LENGTH used, source size, source mtime (ns),
+#            min length, max length, bucket count
+#   table  : one (length, count, offset) entry per bucket
+#   buckets: the words of each length, sorted and packed back to back with a fixed width of
+#            `length` bytes and no separators. Each letter is stored as its code 0-25 (A-Z).
+CACHE_SUFFIX = ".bin"
+
+# The longest word kept, its feedback code (see `game.scoring`) having to fit in 64 bits.
+MAX_WORD_LENGTH = 40
+
+_MAGIC = b"PYWL"
+_VERSION = 3
+_HEADER = struct.Struct("<4sHHQqBBH")
+_BUCKET = struct.Struct("<BIQ")
+
+_LETTERS = b"ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+_ENCODE = bytes.maketrans(_LETTERS, bytes(range(26)))
+_DECODE = bytes.maketrans(bytes(range(26)), _LETTERS)
+
+
+def encode(word: str) -> bytes:
+    """
+    Encodes an ASCII word into its letter codes, 0 for 'A' up to 25 for 'Z'.
+
+    The word is upper-cased first. Characters other than letters keep their ASCII value,
+    which is never a letter code, so such words simply match nothing in the index.
+
+    :param word: The word to encode.
+    :return: The letter codes of the word.
+    """
+    return word.upper().encode("ascii").translate(_ENCODE)
+
+
+def decode(codes: bytes) -> str:
+    """
+    Decodes letter codes produced by `encode` back into an upper-case word.
+
+    :param codes: The letter codes to decode.
+    :return: The decoded word.
+    """
+    return bytes(codes).translate(_DECODE).decode("ascii")
+
+
+class WordBucket:
+    """
+    A read-only sequence over the words of a single length.
+
+    The words live in one contiguous fixed-width buffer of letter codes (the memory-mapped cache,
+    or the bucket read from it in lazy mode) instead of one `str` object per word. The i-th word
+    is found by offset arithmetic and only decoded into a `str` when requested.
+    As the buffer is sorted, it is also its own lookup index: membership is a binary search
+    over it in O(log n), without building any extra structure.
+    """
+
+    def __init__(self, data, offset: int, length: int, count: int) -> None:
+        self.__data = data
+        self.__offset = offset
+        self.__length = length
+        self.__count = count
+
+    def __len__(self) -> int:
+        return self.__count
+
+    def __getitem__(self, index: int) -> str:
+        return decode(self.codes(index))
+
+    def __contains__(self, word: str) -> bool:
+        return self.index(word) != -1
+
+    def __key(self, index: int) -> bytes:
+        start = self.__offset + index * self.__length
+
+        return self.__data[start:start + self.__length]
+
+    def codes(self, index: int) -> bytes:
+        """
+        Returns the letter codes of a word without decoding it.
+
+        :param index: The index of the word.
+        :return: The letter codes of the word.
+        :raises IndexError: If the index is out of range.
+        """
+        if index < 0:
+            index += self.__count
+
+        if not 0 <= index < self.__count:
+            raise IndexError("word index out of range")
+
+        return self.__key(index)
+
+    def get_buffer(self) -> memoryview:
+        """
+        Returns the packed letter codes of the whole bucket, `length` bytes per word.
+
+        :return: A read-only view over the bucket buffer.
+        """
+        start = self.__offset
+
+        return memoryview(self.__data)[start:start + self.__count * self.__length].toreadonly()
+
+    def index(self, word: str) -> int:
+        """
+        Finds the position of a word in the bucket with a binary search.
+
+        The comparison is case-insensitive.
+
+        :param word: The word to look up.
+        :return: The index of the word, or -1 if the word is not in the bucket.
+        """
+        if len(word) != self.__length or not word.isascii():
+            return -1
+
+        key = encode(word)
+        index = bisect_left(range(self.__count), key, key=self.__key)
+
+        if index < self.__count and self.__key(index) == key:
+            return index
+
+        return -1
+
+    def get_length(self) -> int:
+        return self.__length
+
+
+class WordIndex:
+    """
+    The word list compiled into a length-bucketed binary file that is memory-mapped on open.
+
+    The text word list is only parsed when the compiled file is missing or stale, that is when
+    the size or modification time of the source file, or the minimum word length, differs from
+    what is recorded in the header. Every later start maps the compiled file directly.
+
+    In lazy mode only the header (min/max length and per-length counts) is read on open. Each
+    bucket is read from the file the first time it is asked for and kept in a bounded LRU cache,
+    so a session that only plays one or two lengths never loads the others.
+
+    The words are never modified once opened, so an index can be shared by any number of games
+    and threads; see `shared_index` to open each word list only once per process.
+    """
+
+    def __init__(self, source_path: str | Path, min_word_length: int = 3, lazy: bool = False,
+                 cache_size: int = 2) -> None:
+        """
+        Opens the compiled index of the given word list, compiling it first if necessary.
+
+        :param source_path: The path to the text word list, one word per line.
+        :param min_word_length: Words shorter than this are left out of the index.
+        :param lazy: If True, buckets are read on first use instead of being mapped up front.
+        :param cache_size: The maximum number of buckets kept in memory in lazy mode.
+        """
+        self.__source_path = Path(source_path)
+        self.__cache_path = self.__source_path.with_suffix(CACHE_SUFFIX)
+        self.__min_word_length = min_word_length
+        self.__lazy = lazy
+        self.__cache_size = max(1, cache_size)
+
+        self.__file = None
+        self.__data = None
+        # length -> (count, offset) of every bucket in the compiled file.
+        self.__table = {}
+        # The buckets in memory, least recently used first.
+        self.__buckets = OrderedDict()
+        # Guards the bucket cache in lazy mode.
+        self.__lock = threading.Lock()
+
+        if not self.__open():
+            self.__compile()
+
+        self.__min_length = min(self.__table.keys())
+        self.__max_length = max(self.__table.keys())
+
+    @staticmethod
+    def parse(file_path: str | Path, min_word_length: int = 3) -> dict[int, list[str]]:
+        """
+        Parses the text word list into sorted, upper-cased word lists keyed by word length.
+
+        Lines that are shorter than `min_word_length`, longer than `MAX_WORD_LENGTH` or that contain
+        anything other than ASCII letters are skipped.
+
+        :param file_path: The path to the text word list.
+        :param min_word_length: The minimum length of the words to keep.
+        :return: A dictionary mapping each word length to its sorted list of words.
+        """
+        words = {}
+
+        with open(file_path) as f:
+            for line in f:
+                word = line.strip()
+
+                if (min_word_length <= len(word) <= MAX_WORD_LENGTH and word.isascii()
+                        and word.isalpha()):
+                    words.setdefault(len(word), []).append(word.upper())
+
+        for bucket in words.values():
+            bucket.sort()
+
+        return words
+
+    def __source_signature(self) -> tuple[int, int]:
+        stat = os.stat(self.__source_path)
+
+        return stat.st_size, stat.st_mtime_ns
+
+    def __open(self) -> bool:
+        """
+        Reads the bucket table of the compiled file and, unless in lazy mode, maps the whole file.
+
+        :return: True if the compiled file exists and matches the current source, False otherwise.
+        """
+        size, mtime = self.__source_signature()
+
+        try:
+            file = open(self.__cache_path, "rb")
+        except OSError:
+            return False
+
+        try:
+            table = self.__read_table(file, os.fstat(file.fileno()).st_size, size, mtime)
+
+            data = None
+            if table is not None and not self.__lazy:
+                data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError, struct.error):
+            table = None
+
+        if table is None:
+            file.close()
+            return False
+
+        self.__attach(file, data, table)
+
+        return True
+
+    def __read_table(self, file, file_size: int, size: int, mtime: int) -> dict[int, tuple[int, int]] | None:
+        """
+        Reads and validates the header and the bucket table at the start of the compiled file.
+
+        :return: A dictionary mapping each length to the (count, offset) of its bucket,
+                 or None if the file does not belong to the current source.
+        """
+        magic, version, min_word_length, source_size, source_mtime, _, _, bucket_count = \
+            _HEADER.unpack(file.read(_HEADER.size))
+
+        if (magic != _MAGIC or version != _VERSION or min_word_length != self.__min_word_length
+                or source_size != size or source_mtime != mtime):
+            return None
+
+        table = {}
+        for length, count, offset in _BUCKET.iter_unpack(file.read(_BUCKET.size * bucket_count)):
+            if offset + length * count > file_size:
+                return None
+
+            table[length] = (count, offset)
+
+        return table if table else None
+
+    def __attach(self, file, data, table: dict[int, tuple[int, int]]) -> None:
+        self.__file = file
+        self.__data = data
+        self.__table = table
+
+        if not self.__lazy:
+            for length, (count, offset) in table.items():
+                self.__buckets[length] = WordBucket(data, offset, length, count)
+
+    def __compile(self) -> None:
+        """
+        Parses the text word list, writes the compiled file and maps it.
+
+        If the compiled file cannot be written (e.g. a read-only install directory), the compiled
+        data is kept in memory for the lifetime of this index instead.
+        """
+        size, mtime = self.__source_signature()
+        words = self.parse(self.__source_path, self.__min_word_length)
+
+        if not words:
+            raise ValueError(f"No words of length {self.__min_word_length} or more in: {self.__source_path}")
+
+        lengths = sorted(words.keys())
+        offset = _HEADER.size + _BUCKET.size * len(lengths)
+
+        table = []
+        for length in lengths:
+            table.append(_BUCKET.pack(length, len(words[length]), offset))
+            offset += length * len(words[length])
+
+        blob = b"".join([
+            _HEADER.pack(_MAGIC, _VERSION, self.__min_word_length, size, mtime, lengths[0], lengths[-1],
+                         len(lengths)),
+            *table,
+            *(encode("".join(words[length])) for length in lengths)
+        ])
+
+        # Write to a temporary file first so that a concurrent start never maps a partial file.
+        temp_path = self.__cache_path.with_name(f"{self.__cache_path.name}.{os.getpid()}.tmp")
+        try:
+            with open(temp_path, "wb") as f:
+                f.write(blob)
+
+            os.replace(temp_path, self.__cache_path)
+        except OSError:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+
+        if not self.__open():
+            file = io.BytesIO(blob)
+            self.__attach(file, blob, self.__read_table(file, len(blob), size, mtime))
+
+    def __contains__(self, length: int) -> bool:
+        return length in self.__table
+
+    def bucket(self, length: int) -> WordBucket:
+        """
+        Returns the words of the given length, reading them from the compiled file if they are
+        not in memory yet.
+
+        :param length: The word length.
+        :return: The bucket holding every word of that length.
+        :raises KeyError: If there are no words of that length.
+        """
+        if not self.__lazy:
+            # Every bucket is mapped for the lifetime of the index, there is nothing to update.
+            return self.__buckets[length]
+
+        with self.__lock:
+            bucket = self.__buckets.get(length)
+
+            if bucket is not None:
+                self.__buckets.move_to_end(length)
+                return bucket
+
+            count, offset = self.__table[length]
+            bucket = WordBucket(self.__read(offset, length * count), 0, length, count)
+
+            self.__buckets[length] = bucket
+            while len(self.__buckets) > self.__cache_size:
+                self.__buckets.popitem(last=False)
+
+        return bucket
+
+    def __read(self, offset: int, size: int) -> bytes:
+        """
+        Reads bytes of the compiled file at the given offset.
+
+        The file may have been opened before the process forked, its position then being shared
+        with the other processes, so it is read without moving it where the platform allows.
+        """
+        try:
+            fd = self.__file.fileno()
+        except (AttributeError, OSError, io.UnsupportedOperation):
+            # The compiled data kept in memory when the file could not be written.
+            fd = None
+
+        if fd is None or not hasattr(os, "pread"):
+            self.__file.seek(offset)
+            return self.__file.read(size)
+
+        chunks = []
+        while size > 0:
+            chunk = os.pread(fd, size, offset)
+            if not chunk:
+                break
+
+            chunks.append(chunk)
+            offset += len(chunk)
+            size -= len(chunk)
+
+        return b"".join(chunks)
+
+    def get_source_path(self) -> Path:
+        return self.__source_path
+
+    def get_min_word_length(self) -> int:
+        return self.__min_word_length
+
+    def get_min_length(self) -> int:
+        return self.__min_length
+
+    def get_max_length(self) -> int:
+        return self.__max_length
+
+    def get_counts(self) -> dict[int, int]:
+        """
+        Returns the number of words of each length.
+
+        :return: A dictionary mapping each word length to its word count.
+        """
+        return {length: count for length, (count, _) in self.__table.items()}
+
+    def get_word_count(self) -> int:
+        return sum(count for count, _ in self.__table.values())
+
+    def get_loaded_lengths(self) -> list[int]:
+        """
+        Returns the lengths whose buckets are currently in memory, least recently used first in lazy mode.
+
+        :return: A list of word lengths.
+        """
+        return list(self.__buckets.keys())
+
+    def close(self) -> None:
+        """
+        Unmaps the index. An index returned by `shared_index` belongs to every game of the process
+        and is never closed.
+        """
+        self.__buckets.clear()
+
+        if isinstance(self.__data, mmap.mmap):
+            self.__data.close()
+        self.__data = None
+
+        if self.__file is not None:
+            self.__file.close()
+            self.__file = None
+
+
+# The indexes opened by `shared_index`, by word list and options.
+_shared = {}
+_shared_lock = threading.Lock()
+
+
+def _forget_shared() -> None:
+    # A forked child opens indexes of its own rather than using those of its parent, whose lock
+    # may have been held by another thread at the time of the fork.
+    global _shared_lock
+
+    _shared.clear()
+    _shared_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_forget_shared)
+
+
+def shared_index(source_path: str | Path, min_word_length: int = 3, lazy: bool = False,
+                 cache_size: int = 2) -> WordIndex:
+    """
+    Returns the index of a word list opened once per process with the given options, opening it
+    on the first call. The games of the process all draw their words from the same index, while
+    a forked child opens its own on its first call.
+
+    :param source_path: The path to the text word list, one word per line.
+    :param min_word_length: Words shorter than this are left out of the index.
+    :param lazy: If True, buckets are read on first use instead of being mapped up front.
+    :param cache_size: The maximum number of buckets kept in memory in lazy mode.
+    :return: The shared index.
+    """
+    key = (Path(source_path).resolve(), min_word_length, lazy, max(1, cache_size))
+
+    with _shared_lock:
+        index = _shared.get(key)
+
+        if index is None:
+            index = _shared[key] = WordIndex(source_path, min_word_length, lazy, cache_size)
+
+    return index
@@ -5,30 +5,57 @@ from error import LengthNotExist, LetterNotExist
 from config.config import config
 from lang.language import lang
 from utils.utils import *
+from .scoring import score, solved_code, feedback_digits
+from .word_index import WordIndex, encode, decode, shared_index
 
 
 class Wordle:
-    __word_list = {}
-    __chance = 0
-    __word = ''
+    """
+    A game of Wordle: the word to find, the chances left and the guesses made.
 
-    __win_status = False
+    The words come from a `WordIndex` that is shared with every other game of the process and
+    never modified, so a game only holds its own state, in slots, and any number of games can be
+    played at once, from any number of threads as long as each game stays on one of them.
+    """
 
-    def __init__(self, file_path: str | Path) -> None:
-        self.__process_file(file_path)
+    __slots__ = ("__word_list", "__min_length", "__max_length", "__chance", "__word", "__win_status",
+                 "__history", "__rng", "__seed")
 
-        self.__min_length = min(self.__word_list.keys())
-        self.__max_length = max(self.__word_list.keys())
+    # The color of each feedback digit: ABSENT, PRESENT and CORRECT.
+    __colors = (Fore.RED, Fore.YELLOW, Fore.GREEN)
+
+    def __init__(self, word_list: str | Path | WordIndex) -> None:
+        """
+        :param word_list: The path to the text word list, opened once per process and shared by
+                          the games playing from it, or an index already opened.
+        """
+        if isinstance(word_list, WordIndex):
+            self.__word_list = word_list
+        else:
+            self.__process_file(word_list)
+
+        self.__min_length = self.__word_list.get_min_length()
+        self.__max_length = self.__word_list.get_max_length()
+
+        self.__chance = 0
+        # The letter codes of the current word, see `game.word_index.encode`.
+        self.__word = b''
+        self.__win_status = False
+        # Every guess of the current game with its feedback code, oldest first.
+        self.__history = []
+        # The generator the words are drawn from, the module-level one until `seed` is called.
+        self.__rng = random
+        self.__seed = None
 
     def __process_file(self, file_path: str | Path) -> int:
         """
         Process the given file to store words of different lengths in the internal word list.
 
-        This method reads the given file line by line, strips the line of leading and trailing
-        whitespace, and checks if the length of the word is greater than or equal to the minimum
-        word length set in the configuration and if the word consists of only alphabetic characters.
-        If the word passes the check, it is added to the internal word list with its length as the key.
-        The number of words processed is returned.
+        This method opens the compiled word index built from the given file, or reuses the index
+        another game of the process has opened. The index is only rebuilt from the text when the
+        file, or the minimum word length set in the configuration, has changed since it was last
+        compiled. Words shorter than the minimum length or containing non-alphabetic characters
+        are left out. The number of words processed is returned.
 
         :param file_path: The path to the file to be processed.
         :type file_path: str
@@ -36,17 +63,27 @@ class Wordle:
         :returns: The number of words processed.
         :rtype: int
         """
-        count = 0
+        self.__word_list = shared_index(file_path, config.get("MIN_WORD_LENGTH", 3),
+                                        lazy=config.get("LAZY_WORD_LIST", True),
+                                        cache_size=config.get("WORD_CACHE_SIZE", 2))
 
-        with open(file_path) as f:
-            for line in f:
-                word = line.strip()
+        return self.__word_list.get_word_count()
 
-                if len(word) >= config.get("MIN_WORD_LENGTH", 3) and word.isalpha():
-                    self.__word_list.setdefault(len(word), []).append(word)
-                    count += 1
+    def seed(self, seed: int | None) -> None:
+        """
+        Draws the words of the following games from a generator of its own, seeded with the given
+        value, so that the same seed always gives the same sequence of words.
 
-        return count
+        :param seed: The seed, or None to go back to the module-level generator.
+        """
+        self.__rng = random if seed is None else random.Random(seed)
+        self.__seed = seed
+
+    def get_seed(self) -> int | None:
+        """
+        Returns the seed given to `seed`, None when the words are drawn from the module-level generator.
+        """
+        return self.__seed
 
     def start(self, length: int) -> None:
         if length < self.__min_length or length > self.__max_length:
@@ -58,62 +95,65 @@ class Wordle:
 
         self.__word = self.__random(length)
         self.__chance = length + 1
+        self.__win_status = False
+        self.__history = []
 
     def end(self):
         self.__win_status = False
-        self.__word = ''
+        self.__word = b''
         self.__chance = 0
+        self.__history = []
 
-    def check(self, word: str) -> list[dict[str, str]]:
+    def check_code(self, word: str) -> int:
+        """
+        Checks a guess against the current word and returns the feedback as an integer code.
+
+        Digit i of the base-3 code is the feedback of letter i, see `game.scoring.score`.
+        The win status is set when every letter is correct.
+
+        :param word: The guessed word, in any case.
+        :type word: str
+
+        :returns: The feedback code.
+        :rtype: int
+
+        :raises LengthNotExist: If the guess does not have the length of the current word.
+        :raises LetterNotExist: If the guess is not in the word list.
+        """
         if len(word) != len(self.__word):
             raise LengthNotExist(
                 format_string(lang.get("wordle.check.length_not_exist"), f"{Fore.RED}{word}{Fore.RESET}",
                               f"{Fore.GREEN}{len(self.__word)}{Fore.RESET}"))
 
-        if word.upper() not in self.__word_list[len(word)]:
+        if word not in self.__word_list.bucket(len(word)):
             raise LetterNotExist(
                 format_string(lang.get("wordle.check.letter_not_exist"), f"{Fore.RED}{word}{Fore.RESET}"))
 
-        result = []
-        matched = [False] * len(self.__word)
-        # Find the exact match location (Green)
-        # Assume that all char are correct
-        all_correct = True
-        for i in range(len(word)):
-            if word[i].upper() == self.__word[i].upper():
-                result.append({word[i].upper(): Fore.GREEN})
-                # Mark that the location is matched
-                matched[i] = True
-            else:
-                # placeholders, to deal with later
-                result.append(None)
-                all_correct = False
-
-        if all_correct:
+        code = score(encode(word), self.__word)
+
+        if code == solved_code(len(self.__word)):
             self.__win_status = True
-            return result
-
-        # Count the unmatched letters in the target string (Yellow)
-        available_letters = {}
-        for i in range(len(self.__word)):
-            if not matched[i]:
-                letter = self.__word[i].upper()
-                available_letters[letter] = available_letters.get(letter, 0) + 1
-
-        # Handle non-green locations (Red)
-        for i in range(len(word)):
-            if result[i] is not None:
-                continue
-
-            letter = word[i].upper()
-            # Check if the letter is present and available
-            if letter in available_letters and available_letters[letter] > 0:
-                result[i] = {word[i].upper(): Fore.YELLOW}
-                available_letters[letter] -= 1
-            else:
-                result[i] = {word[i].upper(): Fore.RED}
-
-        return result
+
+        self.__history.append((word.upper(), code))
+
+        return code
+
+    def check(self, word: str) -> list[dict[str, str]]:
+        """
+        Checks a guess against the current word and returns the colored letters to display.
+
+        Each letter is green when it is at the right position, yellow when it is elsewhere
+        in the word, and red otherwise.
+
+        :param word: The guessed word, in any case.
+        :type word: str
+
+        :returns: One single-entry dictionary per letter, mapping the upper-case letter to its color.
+        :rtype: list[dict[str, str]]
+        """
+        digits = feedback_digits(self.check_code(word), len(word))
+
+        return [{letter: self.__colors[digit]} for letter, digit in zip(word.upper(), digits)]
 
     def reduce_chance(self) -> None:
         """
@@ -144,26 +184,37 @@ class Wordle:
         :returns: The current word in the game.
         :rtype: str
         """
-        return self.__word
+        return decode(self.__word)
 
     def get_win_status(self) -> bool:
         return self.__win_status
 
-    def __init(self, length: int):
-        pass
+    def get_history(self) -> list[tuple[str, int]]:
+        """
+        Returns the guesses of the current game.
 
-    def __random(self, length: int) -> str:
+        :returns: Each guess, upper-cased, with its feedback code, oldest first.
+        :rtype: list[tuple[str, int]]
+        """
+        return list(self.__history)
+
+    def get_word_list(self) -> WordIndex:
+        return self.__word_list
+
+    def __random(self, length: int) -> bytes:
         """
         Selects a random word of the specified length from the internal word list.
 
-        This method uses the random.choice function to return a word from the list
-        of words that match the given length. It assumes that the list for the specified
-        length is non-empty.
+        This method picks a random index into the bucket of words that match the given
+        length and returns that word's letter codes, without decoding it. It assumes that
+        the bucket for the specified length is non-empty.
 
         :param length: The length of the word to be selected.
         :type length: int
 
-        :returns: A randomly selected word of the specified length.
-        :rtype: str
+        :returns: The letter codes of a randomly selected word of the specified length.
+        :rtype: bytes
         """
-        return random.choice(self.__word_list[length])
+        bucket = self.__word_list.bucket(length)
+
+        return bucket.codes(self.__rng.randrange(len(bucket)))
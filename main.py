@@ -2,7 +2,11 @@
 try:
     import winreg as _winreg
 except ImportError:
-    import _winreg
+    try:
+        import _winreg
+    except ImportError:
+        # Neither exists outside of Windows, where the headless commands may also run.
+        _winreg = None
 
 # Fix the StringIO issue
 try:
@@ -11,24 +15,88 @@ except ImportError:
     from io import StringIO
 
 import argparse
-import colorama
+import importlib
+import sys
+
 import config.config as config
 
-from game.game_controller import GameController
+from utils.utils import get_resource_path
 
-colorama.init(autoreset=True)
+# The subcommands: the module running each, the function adding its arguments, and its help.
+COMMANDS = {
+    "simulate": ("game.simulator", "add_arguments",
+                 "Play games without a terminal and report the win rate and guess distribution"),
+    "bench": ("bench.suite", "add_arguments", "Run the benchmark suite and report the results as JSON"),
+    "load": ("bench.load", "add_arguments",
+             "Play games with many simulated players at once and report the throughput and latency percentiles"),
+    "record": ("game.recording", "add_record_arguments", "Play the game, recording the keys pressed to a file"),
+    "replay": ("game.recording", "add_replay_arguments",
+               "Replay recorded sessions headless as fast as possible and report the time taken"),
+    "serve": ("game.server", "add_arguments", "Serve games to many clients over TCP, one JSON request per line"),
+}
 
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser()
     parser.add_argument("-d", "--debug", help="Enable debug mode", action="store_true")
+    parser.add_argument("--protocol", action="store_true", help="Play without the terminal UI, reading JSON "
+                                                                "requests from stdin and writing the replies to stdout")
+
+    # Only the module of the command given is imported for its arguments, as some of them pull in
+    # the terminal UI or numpy, which neither the game nor the protocol mode need at startup.
+    requested = next((arg for arg in sys.argv[1:] if not arg.startswith("-")), None)
+
+    subparsers = parser.add_subparsers(dest="command")
+    for name, (module, add_arguments, description) in COMMANDS.items():
+        subparser = subparsers.add_parser(name, help=description)
+
+        if name == requested:
+            getattr(importlib.import_module(module), add_arguments)(subparser)
 
-    return parser.parse_args()
+    args = parser.parse_args()
+
+    if args.protocol and args.command:
+        parser.error(f"--protocol cannot be combined with the '{args.command}' command")
+
+    return args
 
 
 if __name__ == '__main__':
     args = parse_args()
     config.DEBUG = args.debug
 
-    game = GameController()
-    game.run()
+    match args.command:
+        case None if args.protocol:
+            from game import protocol
+
+            protocol.run(get_resource_path("word_list.txt"))
+        case "simulate":
+            from game import simulator
+
+            simulator.run(args, get_resource_path("word_list.txt"))
+        case "bench":
+            from bench import suite
+
+            suite.run(args)
+        case "load":
+            from bench import load
+
+            load.run(args)
+        case "record":
+            from game import recording
+
+            recording.record(args)
+        case "replay":
+            from game import recording
+
+            recording.run_replay(args)
+        case "serve":
+            from game import server
+
+            server.run(args, get_resource_path("word_list.txt"))
+        case _:
+            # Only the interactive game needs the terminal UI.
+            from game.game_controller import GameController
+
+            game = GameController()
+            game.run()
@@ -0,0 +1,78 @@
+import pytest
+
+import config.config as config
+
+from ui.backend import VirtualScreen
+from ui.terminal_controller import TerminalController
+from ui.frame_buffer import DEFAULT_STYLE, FrameBuffer
+
+COLUMNS, LINES = 80, 24
+
+# Starts a game of five letters.
+START = ["KEY_ENTER", "5", "KEY_ENTER"]
+# Guesses a word, the input box keeping the focus.
+GUESS = [*START, "crane", "KEY_ENTER"]
+# Leaves the input box with Esc.
+LEAVE = [*START, "KEY_ESCAPE"]
+
+
+class SnapshotScreen(VirtualScreen):
+    """
+    A virtual screen keeping the cells of the game screen as they were when the game left it.
+    """
+
+    cells = None
+
+    def write(self, text: str) -> None:
+        if "\x1b[?1049l" in text:
+            self.cells = [[self.get_cell(line, column) for column in range(1, COLUMNS + 1)]
+                          for line in range(1, LINES + 1)]
+
+        super().write(text)
+
+
+def play(monkeypatch, frame_buffer: bool, keys: list[str]) -> list:
+    from game.game_controller import GameController
+
+    monkeypatch.setitem(config.config.config, "FRAME_BUFFER", frame_buffer)
+
+    screen = SnapshotScreen(COLUMNS, LINES)
+    screen.get_keyboard().feed(*keys)
+
+    game = GameController(screen)
+    game.game.seed(0)
+
+    with pytest.raises(EOFError):
+        game.run()
+
+    return screen.cells
+
+
+@pytest.mark.parametrize("keys", [GUESS, LEAVE])
+@pytest.mark.parametrize("language", ["en_us", "zh_cn"])
+def test_frame_buffer_matches_direct_output(monkeypatch, language, keys):
+    monkeypatch.setitem(config.config.config, "LANGUAGE", language)
+
+    assert play(monkeypatch, True, keys) == play(monkeypatch, False, keys)
+
+
+def test_lines_are_cut_at_the_screen_width():
+    frame = FrameBuffer(4)
+    frame.write(1, 1, "abcdef")
+    # The wide character would cover the fourth and fifth columns.
+    frame.write(2, 1, "abc\u7389")
+
+    assert frame.get_line(1) == tuple((char, DEFAULT_STYLE) for char in "abcd")
+    assert frame.get_line(2) == tuple((char, DEFAULT_STYLE) for char in "abc")
+
+
+@pytest.mark.parametrize("frame_buffer", [True, False])
+def test_line_wider_than_the_screen_does_not_wrap(frame_buffer):
+    screen = VirtualScreen(10, 3)
+    tc = TerminalController(screen, frame_buffer=frame_buffer)
+
+    tc.write_lines(1, ["\x1b[33m" + "-" * 12 + "\x1b[0m", "|" + " " * 8 + "|"], 2).flush()
+    # Only the style of the first line changes, the second one is not drawn again.
+    tc.write_lines(1, ["-" * 12, "|" + " " * 8 + "|"], 2).flush()
+
+    assert screen.get_line(2) == "|" + " " * 8 + "|"
@@ -0,0 +1,55 @@
+import random
+
+import numpy as np
+import pytest
+
+from pathlib import Path
+
+from game.candidates import CandidateSet
+from game.scoring import as_matrix, score, score_matrix
+from game.word_index import WordIndex
+
+WORD_LIST = Path(__file__).resolve().parent.parent / "word_list.txt"
+
+
+@pytest.fixture(scope="module")
+def index():
+    index = WordIndex(WORD_LIST)
+    yield index
+    index.close()
+
+
+@pytest.mark.parametrize("length", [3, 5, 8, 15])
+def test_score_matrix_matches_score(index, length):
+    bucket = index.bucket(length)
+    rng = random.Random(length)
+    # Every answer is scored against a few guesses, duplicated letters included.
+    answers = as_matrix(bucket)[rng.sample(range(len(bucket)), min(500, len(bucket)))]
+
+    for _ in range(20):
+        guess = bucket.codes(rng.randrange(len(bucket)))
+        codes = score_matrix(guess, answers)
+
+        assert codes.tolist() == [score(guess, answer.tobytes()) for answer in answers]
+
+
+@pytest.mark.parametrize("length", [4, 5, 7])
+def test_candidates_match_rescoring(index, length):
+    bucket = index.bucket(length)
+    answers = as_matrix(bucket)
+    rng = random.Random(length)
+
+    for _ in range(10):
+        answer = bucket.codes(rng.randrange(len(bucket)))
+        candidates = CandidateSet(bucket)
+        expected = np.ones(len(bucket), dtype=bool)
+
+        for _ in range(4):
+            guess = bucket.codes(rng.randrange(len(bucket)))
+            code = score(guess, answer)
+
+            candidates.narrow(guess, code)
+            expected &= score_matrix(guess, answers) == code
+
+            assert candidates.indices().tolist() == np.flatnonzero(expected).tolist()
+            assert len(candidates) == int(expected.sum())
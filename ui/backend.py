@@ -0,0 +1,397 @@
+import io
+import os
+import sys
+
+import colorama
+
+from abc import ABC, abstractmethod
+from collections import Counter, deque
+from contextlib import nullcontext
+
+from blessed.keyboard import Keystroke, get_keyboard_codes
+from wcwidth import wcwidth
+
+import config.config as config
+
+from utils.utils import get_terminal_size
+from .frame_buffer import DEFAULT_STYLE, WIDE_TAIL, apply_sgr, ESCAPE
+
+
+class Backend(ABC):
+    """
+    The terminal the UI draws on: where the output of the terminal controller goes, the size of the
+    screen, and the keyboard the key handler reads from.
+    """
+
+    @abstractmethod
+    def write(self, text: str) -> None:
+        """
+        Writes text to the screen, shown once the frame is flushed.
+        """
+
+    @abstractmethod
+    def flush(self) -> None:
+        """
+        Ends a frame, making what was written since the last flush visible.
+        """
+
+    @abstractmethod
+    def get_size(self) -> tuple[int, int]:
+        """
+        :return: The size of the screen as (columns, lines).
+        """
+
+    @abstractmethod
+    def get_keyboard(self) -> any:
+        """
+        :return: The object the key handler reads the keys from, a blessed `Terminal` or alike.
+        """
+
+
+class TerminalBackend(Backend):
+    """
+    The terminal the game runs in, through stdout and blessed.
+
+    By default the output is encoded into a reusable buffer and written straight to the file
+    descriptor of stdout once per frame, the escape sequences being understood by the terminal
+    itself. On Windows, where colorama only switches the console to VT processing, and when stdout
+    has no file descriptor, the text goes to `sys.stdout` as is. With native=False, `sys.stdout` is
+    wrapped by colorama, which translates the sequences for consoles that do not understand them.
+    """
+
+    def __init__(self, native: bool | None = None) -> None:
+        """
+        :param native: Whether to write to the file descriptor, by default the NATIVE_OUTPUT setting.
+        """
+        self.__size = get_terminal_size()
+        self.__keyboard = None
+        self.__fd = None
+
+        if native is None:
+            native = config.config.get("NATIVE_OUTPUT", True)
+
+        if not native:
+            colorama.init(autoreset=True)
+            return
+
+        # Only turns on VT processing on Windows consoles, without wrapping stdout.
+        colorama.just_fix_windows_console()
+
+        # The Windows console takes text through sys.stdout rather than bytes on its descriptor.
+        if os.name != 'nt':
+            try:
+                self.__fd = sys.stdout.fileno()
+            except (AttributeError, ValueError, io.UnsupportedOperation):
+                # Replaced by an object without a descriptor, like the counting stream of the benchmarks.
+                return
+
+            # Flush what was printed before, so that it comes before the frames.
+            sys.stdout.flush()
+            self.__buffer = bytearray()
+
+    def write(self, text: str) -> None:
+        if self.__fd is not None:
+            self.__buffer += text.encode("utf-8")
+        else:
+            # Looked up on every write, as stdout may be wrapped (colorama) or replaced (benchmarks).
+            sys.stdout.write(text)
+
+    def flush(self) -> None:
+        if self.__fd is None:
+            sys.stdout.flush()
+            return
+
+        view = memoryview(self.__buffer)
+        try:
+            while view:
+                view = view[os.write(self.__fd, view):]
+        finally:
+            view.release()
+            self.__buffer.clear()
+
+    def get_size(self) -> tuple[int, int]:
+        return self.__size
+
+    def get_keyboard(self) -> any:
+        if self.__keyboard is None:
+            # Created on first use, as blessed queries the terminal when it starts.
+            from blessed import Terminal
+            self.__keyboard = Terminal()
+
+        return self.__keyboard
+
+
+class VirtualKeyboard:
+    """
+    A keyboard replaying keys given in advance, with the part of the blessed `Terminal` interface the
+    key handler uses. Reading a key once all of them have been read raises EOFError.
+    """
+
+    # The sequences sent by the special keys, by key name.
+    SEQUENCES = {
+        "KEY_ENTER": "\r",
+        "KEY_ESCAPE": "\x1b",
+        "KEY_BACKSPACE": "\x7f",
+        "KEY_TAB": "\t",
+        "KEY_UP": "\x1b[A",
+        "KEY_DOWN": "\x1b[B",
+        "KEY_RIGHT": "\x1b[C",
+        "KEY_LEFT": "\x1b[D",
+    }
+
+    __codes = {name: code for code, name in get_keyboard_codes().items()}
+
+    def __init__(self) -> None:
+        self.__keys = deque()
+
+    def feed(self, *keys: str) -> None:
+        """
+        Queues keys to be read.
+
+        :param keys: Key names ("KEY_UP", see `ui.keymap.key_name`), or text typed one character at a time.
+        """
+        for key in keys:
+            if key in self.__codes:
+                self.__keys.append(Keystroke(self.SEQUENCES.get(key, ""), self.__codes[key], key))
+            else:
+                self.__keys.extend(Keystroke(char) for char in key)
+
+    def pending(self) -> int:
+        return len(self.__keys)
+
+    def inkey(self, timeout: float | None = None, **kwargs) -> Keystroke:
+        if not self.__keys:
+            if timeout is not None:
+                return Keystroke()
+            raise EOFError("No more keys to read.")
+
+        return self.__keys.popleft()
+
+    def cbreak(self) -> nullcontext:
+        return nullcontext()
+
+    def hidden_cursor(self) -> nullcontext:
+        return nullcontext()
+
+    def normal_cursor(self) -> str:
+        return ""
+
+
+class VirtualScreen(Backend):
+    """
+    An in-memory terminal interpreting the output of the UI into a grid of cells.
+
+    Supports the sequences the game emits: cursor positioning and movement, erasing in the line or
+    the display, colors and attributes (SGR), the alternate screen, line breaks and automatic
+    wrapping at the right margin.
+    Other sequences are counted but have no effect on the grid.
+
+    Along with the grid, it keeps the bytes, writes and escape sequences of each frame (the output
+    between two flushes), so that the UI can be run and measured end to end without a terminal.
+    """
+
+    # The kinds of sequences counted, by final character.
+    SEQUENCE_NAMES = {
+        "H": "CUP", "f": "CUP", "A": "CUU", "B": "CUD", "C": "CUF", "D": "CUB", "G": "CHA",
+        "J": "ED", "K": "EL", "m": "SGR", "s": "SCP", "u": "RCP", "h": "SM", "l": "RM",
+    }
+
+    def __init__(self, columns: int = 80, lines: int = 24) -> None:
+        self.__columns = columns
+        self.__lines = lines
+        self.__grid = [self.__blank_line() for _ in range(lines)]
+        # The cursor, 0-based, and whether the next character wraps to the next line first.
+        self.__line = self.__column = 0
+        self.__pending_wrap = False
+        self.__saved = (0, 0)
+        self.__style = DEFAULT_STYLE
+        # The main screen while the alternate screen is shown.
+        self.__main_screen = None
+
+        self.__keyboard = VirtualKeyboard()
+        self.__frames = []
+        self.__frame = self.__new_frame()
+
+    def __blank_line(self) -> list:
+        return [(" ", DEFAULT_STYLE)] * self.__columns
+
+    @staticmethod
+    def __new_frame() -> dict:
+        return {"bytes": 0, "writes": 0, "sequences": Counter()}
+
+    def write(self, text: str) -> None:
+        self.__frame["bytes"] += len(text.encode("utf-8"))
+        self.__frame["writes"] += 1
+
+        for i, part in enumerate(ESCAPE.split(text)):
+            if i % 2 == 1:
+                self.__sequence(part)
+            else:
+                for char in part:
+                    self.__char(char)
+
+    def flush(self) -> None:
+        if self.__frame["writes"]:
+            self.__frames.append(self.__frame)
+            self.__frame = self.__new_frame()
+
+    def get_size(self) -> tuple[int, int]:
+        return self.__columns, self.__lines
+
+    def get_keyboard(self) -> VirtualKeyboard:
+        return self.__keyboard
+
+    def get_frames(self) -> list[dict]:
+        """
+        :return: The frames flushed so far, each with its bytes, writes and a counter of its
+                 escape sequences by kind (see `SEQUENCE_NAMES`, other sequences being counted as "other").
+        """
+        return self.__frames
+
+    def reset_frames(self) -> list[dict]:
+        """
+        Forgets the frames flushed so far, and returns them.
+        """
+        frames, self.__frames = self.__frames, []
+
+        return frames
+
+    def get_cursor(self) -> tuple[int, int]:
+        """
+        :return: The cursor position as 1-based (line, column).
+        """
+        return self.__line + 1, self.__column + 1
+
+    def get_cell(self, line: int, column: int) -> tuple[str, tuple]:
+        """
+        :return: The character and style of a cell, at 1-based coordinates.
+        """
+        return self.__grid[line - 1][column - 1]
+
+    def get_line(self, line: int) -> str:
+        """
+        :return: The text of a 1-based line, without styles and trailing spaces.
+        """
+        return "".join(char for char, _ in self.__grid[line - 1]).rstrip()
+
+    def get_text(self) -> str:
+        """
+        :return: The text of the whole screen, one line per screen line.
+        """
+        return "\n".join(self.get_line(line) for line in range(1, self.__lines + 1))
+
+    def __sequence(self, sequence: str) -> None:
+        final = sequence[-1]
+        parameters = sequence[2:-1]
+        self.__frame["sequences"][self.SEQUENCE_NAMES.get(final, "other")] += 1
+
+        if parameters.startswith("?"):
+            if parameters == "?1049":
+                self.__switch_screen(final == "h")
+            return
+
+        values = [int(value) if value.isdigit() else 0 for value in parameters.split(";")]
+        first = values[0] or 1
+        self.__pending_wrap = False
+
+        match final:
+            case "H" | "f":
+                line = values[0] if values[0] else 1
+                column = values[1] if len(values) > 1 and values[1] else 1
+                self.__move(line - 1, column - 1)
+            case "A":
+                self.__move(self.__line - first, self.__column)
+            case "B":
+                self.__move(self.__line + first, self.__column)
+            case "C":
+                self.__move(self.__line, self.__column + first)
+            case "D":
+                self.__move(self.__line, self.__column - first)
+            case "G":
+                self.__move(self.__line, first - 1)
+            case "K":
+                self.__erase_line(self.__line, values[0])
+            case "J":
+                self.__erase_display(values[0])
+            case "m":
+                self.__style = apply_sgr(self.__style, parameters)
+            case "s":
+                self.__saved = (self.__line, self.__column)
+            case "u":
+                self.__move(*self.__saved)
+
+    def __switch_screen(self, alternate: bool) -> None:
+        if alternate and self.__main_screen is None:
+            self.__main_screen = (self.__grid, self.__line, self.__column)
+            self.__grid = [self.__blank_line() for _ in range(self.__lines)]
+        elif not alternate and self.__main_screen is not None:
+            self.__grid, self.__line, self.__column = self.__main_screen
+            self.__main_screen = None
+
+    def __move(self, line: int, column: int) -> None:
+        self.__line = min(max(line, 0), self.__lines - 1)
+        self.__column = min(max(column, 0), self.__columns - 1)
+
+    def __erase_line(self, line: int, mode: int) -> None:
+        row = self.__grid[line]
+        start, end = {0: (self.__column, self.__columns), 1: (0, self.__column + 1)}.get(mode, (0, self.__columns))
+
+        for column in range(start, end):
+            row[column] = (" ", DEFAULT_STYLE)
+
+    def __erase_display(self, mode: int) -> None:
+        if mode == 0:
+            self.__erase_line(self.__line, 0)
+            lines = range(self.__line + 1, self.__lines)
+        elif mode == 1:
+            self.__erase_line(self.__line, 1)
+            lines = range(0, self.__line)
+        else:
+            lines = range(self.__lines)
+
+        for line in lines:
+            self.__grid[line] = self.__blank_line()
+
+    def __line_feed(self) -> None:
+        if self.__line == self.__lines - 1:
+            self.__grid.pop(0)
+            self.__grid.append(self.__blank_line())
+        else:
+            self.__line += 1
+
+    def __char(self, char: str) -> None:
+        if char == "\n":
+            # Output post-processing of a terminal in cbreak mode turns a line feed into CR LF.
+            self.__line_feed()
+            self.__column = 0
+            self.__pending_wrap = False
+            return
+        if char == "\r":
+            self.__column = 0
+            self.__pending_wrap = False
+            return
+
+        width = wcwidth(char)
+        if width < 0:
+            return
+        if width == 0:
+            if self.__column > 0:
+                previous, style = self.__grid[self.__line][self.__column - 1]
+                self.__grid[self.__line][self.__column - 1] = (previous + char, style)
+            return
+
+        if self.__pending_wrap or self.__column + width > self.__columns:
+            self.__line_feed()
+            self.__column = 0
+            self.__pending_wrap = False
+
+        row = self.__grid[self.__line]
+        row[self.__column] = (char, self.__style)
+        if width == 2:
+            row[self.__column + 1] = (WIDE_TAIL, self.__style)
+
+        if self.__column + width >= self.__columns:
+            self.__column = self.__columns - 1
+            self.__pending_wrap = True
+        else:
+            self.__column += width
@@ -0,0 +1,271 @@
+import re
+
+from functools import lru_cache
+from wcwidth import wcwidth
+
+# A cell is a (character, style) pair. A character wider than one column is followed by
+# WIDE_TAIL cells standing for the columns it covers.
+WIDE_TAIL = ""
+
+# A style is (foreground, background, attributes), the colors being SGR parameter strings
+# (e.g. "31" or "38;5;208") or None for the default, and the attributes a frozenset of the
+# active SGR attribute codes (bold, italic...).
+DEFAULT_STYLE = (None, None, frozenset())
+
+ESCAPE = re.compile(r"(\x1b\[[0-?]*[ -/]*[@-~])")
+
+# SGR codes turning attributes off, mapped to the attributes they turn off.
+_ATTRIBUTES_OFF = {21: {1}, 22: {1, 2}, 23: {3}, 24: {4}, 25: {5, 6}, 27: {7}, 28: {8}, 29: {9}}
+
+
+def apply_sgr(style: tuple, parameters: str) -> tuple:
+    """
+    Applies the parameters of an SGR sequence (the part between "ESC[" and "m") to a style.
+
+    :param style: The style before the sequence.
+    :param parameters: The semicolon-separated SGR parameters.
+    :return: The style after the sequence.
+    """
+    foreground, background, attributes = style
+    codes = [int(code) if code else 0 for code in parameters.split(";")]
+    i = 0
+
+    while i < len(codes):
+        code = codes[i]
+
+        if code == 0:
+            foreground, background, attributes = DEFAULT_STYLE
+        elif code in (38, 48):
+            # Extended colors: 38;5;n or 38;2;r;g;b.
+            size = 3 if i + 1 < len(codes) and codes[i + 1] == 5 else 5
+            color = ";".join(str(c) for c in codes[i:i + size])
+            i += size - 1
+
+            if code == 38:
+                foreground = color
+            else:
+                background = color
+        elif 30 <= code <= 37 or 90 <= code <= 97:
+            foreground = str(code)
+        elif code == 39:
+            foreground = None
+        elif 40 <= code <= 47 or 100 <= code <= 107:
+            background = str(code)
+        elif code == 49:
+            background = None
+        elif 1 <= code <= 9:
+            attributes = attributes | {code}
+        elif code in _ATTRIBUTES_OFF:
+            attributes = attributes - _ATTRIBUTES_OFF[code]
+
+        i += 1
+
+    return foreground, background, frozenset(attributes)
+
+
+@lru_cache(maxsize=64)
+def sgr(style: tuple) -> str:
+    """
+    Returns the SGR sequence that sets exactly the given style, whatever the current one is.
+    """
+    foreground, background, attributes = style
+    parameters = ["0", *(str(code) for code in sorted(attributes))]
+
+    if foreground is not None:
+        parameters.append(foreground)
+    if background is not None:
+        parameters.append(background)
+
+    return f"\x1b[{';'.join(parameters)}m"
+
+
+@lru_cache(maxsize=4096)
+def parse_line(text: str, style: tuple = DEFAULT_STYLE) -> tuple[tuple, tuple]:
+    """
+    Splits a line of text with SGR sequences into the cells it covers on screen.
+
+    Other escape sequences and line breaks are dropped, as a line only describes its own cells.
+
+    :param text: The text of the line.
+    :param style: The style in effect at the start of the text.
+    :return: A tuple of (character, style) cells, and the style in effect at the end of the text.
+    """
+    cells = []
+
+    for i, part in enumerate(ESCAPE.split(text)):
+        if i % 2 == 1:
+            if part.endswith("m"):
+                style = apply_sgr(style, part[2:-1])
+            continue
+
+        for char in part:
+            width = wcwidth(char)
+
+            if width < 0:
+                continue
+            if width == 0 and cells:
+                cells[-1] = (cells[-1][0] + char, cells[-1][1])
+                continue
+
+            cells.append((char, style))
+            if width == 2:
+                cells.append((WIDE_TAIL, style))
+
+    return tuple(cells), style
+
+
+def parse_cells(text: str, style: tuple = DEFAULT_STYLE) -> tuple:
+    """
+    Returns the cells a line of text with SGR sequences covers on screen, see `parse_line`.
+    """
+    return parse_line(text, style)[0]
+
+
+class FrameBuffer:
+    """
+    Double buffer of the screen lines, used to emit only the cells that changed between frames.
+
+    The front buffer holds what is currently on screen and the back buffer the frame being drawn.
+    `render` compares the lines drawn since the last frame with the screen and returns the escape
+    sequences updating only the changed spans, then makes the back buffer the new front buffer.
+
+    Lines are cut at the width of the screen, as the part past it would wrap onto the next line,
+    where the buffer does not know it is.
+    """
+
+    # Unchanged cells between two changed spans are rewritten rather than jumped over when they
+    # are fewer than this, as a cursor move costs about as many bytes.
+    MERGE_GAP = 8
+
+    def __init__(self, columns: int | None = None) -> None:
+        """
+        :param columns: The width of the screen, None for lines of any width.
+        """
+        self.__columns = columns
+        # line -> tuple of cells; a missing line is blank.
+        self.__front = {}
+        self.__back = {}
+        self.__dirty = set()
+
+    def get_line(self, line: int) -> tuple:
+        """
+        Returns the cells of a line of the frame being drawn.
+        """
+        return self.__back.get(line, ())
+
+    def set_line(self, line: int, cells: tuple) -> None:
+        """
+        Replaces a line of the frame being drawn.
+        """
+        if self.__columns is not None and len(cells) > self.__columns:
+            # A wide character cut in half by the edge is blanked.
+            if cells[self.__columns][0] == WIDE_TAIL:
+                cells = cells[:self.__columns - 1] + ((" ", cells[self.__columns - 1][1]),)
+            else:
+                cells = cells[:self.__columns]
+
+        # Trailing blank cells in the default style look exactly like no cells at all.
+        end = len(cells)
+        while end and cells[end - 1] == (" ", DEFAULT_STYLE):
+            end -= 1
+
+        self.__back[line] = cells[:end]
+        self.__dirty.add(line)
+
+    def write(self, line: int, column: int, text: str, style: tuple = DEFAULT_STYLE) -> tuple:
+        """
+        Draws text over a line of the frame, starting at the given column (1-based).
+
+        :param style: The style in effect at the start of the text, the one the previous line of a
+                      multi-line write ended with.
+        :return: The style in effect at the end of the text.
+        """
+        cells, style = parse_line(text, style)
+        old = self.get_line(line)
+        start = max(column, 1) - 1
+
+        if len(old) < start:
+            old = old + ((" ", DEFAULT_STYLE),) * (start - len(old))
+
+        before, after = old[:start], old[start + len(cells):]
+
+        # A wide character cut in half by the text is blanked, as a terminal would do.
+        if start < len(old) and old[start][0] == WIDE_TAIL:
+            before = before[:-1] + ((" ", before[-1][1]),)
+        if after and after[0][0] == WIDE_TAIL:
+            after = ((" ", after[0][1]),) + after[1:]
+
+        self.set_line(line, before + cells + after)
+
+        return style
+
+    def clear(self) -> None:
+        """
+        Forgets the screen contents, for when the screen has just been cleared outside of the buffer.
+        """
+        self.__front = {}
+        self.__back = {}
+        self.__dirty = set()
+
+    def render(self) -> str:
+        """
+        Returns the escape sequences turning the screen into the frame drawn since the last call.
+
+        :return: The sequences to write, empty if nothing changed.
+        """
+        output = []
+        current = None
+
+        for line in sorted(self.__dirty):
+            new = self.__back.get(line, ())
+            old = self.__front.get(line, ())
+
+            if new == old:
+                continue
+
+            for start, end in self.__changed_spans(old, new):
+                # Never start in the middle of a wide character.
+                while start > 0 and start < len(new) and new[start][0] == WIDE_TAIL:
+                    start -= 1
+
+                output.append(f"\x1b[{line};{start + 1}H")
+
+                for char, style in new[start:end]:
+                    if style != current:
+                        output.append(sgr(style))
+                        current = style
+                    output.append(char)
+
+            if len(new) < len(old):
+                if current != DEFAULT_STYLE:
+                    output.append(sgr(DEFAULT_STYLE))
+                    current = DEFAULT_STYLE
+                output.append(f"\x1b[{line};{len(new) + 1}H\x1b[K")
+
+            self.__front[line] = new
+
+        if current not in (None, DEFAULT_STYLE):
+            output.append(sgr(DEFAULT_STYLE))
+
+        self.__dirty.clear()
+
+        return "".join(output)
+
+    def __changed_spans(self, old: tuple, new: tuple) -> list[tuple[int, int]]:
+        """
+        Returns the [start, end) ranges of cells of the new line that differ from the old one,
+        merged when they are close to each other. Cells past the end of the new line are left
+        to the caller, which erases them.
+        """
+        spans = []
+
+        for i, cell in enumerate(new):
+            if i < len(old) and old[i] == cell:
+                continue
+
+            if spans and i - spans[-1][1] < self.MERGE_GAP:
+                spans[-1][1] = i + 1
+            else:
+                spans.append([i, i + 1])
+
+        return spans
@@ -1,9 +1,65 @@
-from typing import Dict
+import os
+import selectors
 
 from blessed import Terminal
+from blessed.keyboard import Keystroke
+from .keymap import Keymap, key_name, MENU_KEYMAP, INPUT_KEYMAP
 
 
 class KeyHandler:
+    # The selectors waiting on the keyboard of each terminal, by file descriptor.
+    __selectors = {}
+    # Called before reading a key, see `set_frame_hook`.
+    __frame_hook = None
+
+    @staticmethod
+    def set_frame_hook(hook: callable) -> None:
+        """
+        Sets the function drawing the pending screen updates before a key is read.
+
+        It is called with force=True before waiting for a key, so that the screen is up to date while
+        the game is idle, and with force=False when a key is already pending, in which case it may skip
+        the frame to keep up with the keys.
+
+        :param hook: A function taking the force flag, or None.
+        """
+        KeyHandler.__frame_hook = hook
+
+    @staticmethod
+    def read_key(term: Terminal) -> Keystroke:
+        """
+        Blocks until a key is pressed and returns it.
+
+        The process sleeps in the selector until the keyboard becomes readable, so that it does not
+        wake up while idle and a key is handled as soon as it arrives. Where the keyboard cannot be
+        waited on with a selector (Windows consoles, virtual keyboards), the blocking `inkey` of the
+        terminal is used instead.
+
+        :param term: The terminal to read from, in cbreak or raw mode.
+        :return: The key pressed.
+        """
+        fd = getattr(term, "_keyboard_fd", None)
+        hook = KeyHandler.__frame_hook or (lambda force: None)
+
+        if os.name == 'nt' or fd is None:
+            hook(True)
+            return term.inkey()
+
+        selector = KeyHandler.__selectors.get(fd)
+        if selector is None:
+            selector = KeyHandler.__selectors[fd] = selectors.DefaultSelector()
+            selector.register(fd, selectors.EVENT_READ)
+
+        while True:
+            # Keys left in blessed's buffer by a previous read come first, without waiting.
+            key = term.inkey(timeout=0)
+            if key:
+                hook(False)
+                return key
+
+            hook(True)
+            selector.select()
+
     @staticmethod
     def register_menu(term: Terminal, menu: list[str], default_option: int = 0,
                       on_enter: callable = lambda x: None) -> int:
@@ -13,18 +69,17 @@ class KeyHandler:
         try:
             with term.cbreak(), term.hidden_cursor():
                 while True:
-                    key = term.inkey(timeout=0.1)
-
-                    if repr(key) == "KEY_UP":
-                        current_selected = (current_selected - 1) % len(menu)
-                        on_enter(current_selected)
-                    elif repr(key) == "KEY_DOWN":
-                        current_selected = (current_selected + 1) % len(menu)
-                        on_enter(current_selected)
-                    elif key == "KEY_ENTER" or key == "\n" or key == "\r":
-                        return current_selected
-                    elif key == "KEY_ESCAPE" or key == "\x1b":
-                        return -1
+                    match MENU_KEYMAP.get(KeyHandler.read_key(term)):
+                        case "previous":
+                            current_selected = (current_selected - 1) % len(menu)
+                            on_enter(current_selected)
+                        case "next":
+                            current_selected = (current_selected + 1) % len(menu)
+                            on_enter(current_selected)
+                        case "select":
+                            return current_selected
+                        case "back":
+                            return -1
         finally:
             term.normal_cursor()
 
@@ -37,53 +92,56 @@ class KeyHandler:
 
         with term.cbreak():
             while True:
-                key = term.inkey(timeout=0.1)
-
-                if key == "KEY_ENTER" or key == "\n" or key == "\r":
-                    on_render(text, False)
-                    break
-                elif key == "KEY_BACKSPACE" or key == "\x7f":
-                    text = text[:-1]
-                    on_render(text, False)
-                elif key == "KEY_ESCAPE" or key == "\x1b":
-                    if on_esc:
-                        # Adjust the input status to disable after pressing 'esc'.
-                        on_render(text, True)
-                        is_exit = on_esc()
-
-                    if exit_on_esc or is_exit == True or is_exit == '/exit':
-                        return '/exit'
-
-                    # Press esc to restore the input state after the function executed by 'esc'.
-                    on_render(text, False)
-
-                # Render the button pressed.
-                elif key.is_sequence is False and key != "":
-                    text += key
-                    on_render(text, False)
+                key = KeyHandler.read_key(term)
+
+                match INPUT_KEYMAP.get(key):
+                    case "submit":
+                        on_render(text, False)
+                        break
+                    case "delete":
+                        text = text[:-1]
+                        on_render(text, False)
+                    case "escape":
+                        if on_esc:
+                            # Adjust the input status to disable after pressing 'esc'.
+                            on_render(text, True)
+                            is_exit = on_esc()
+
+                        if exit_on_esc or is_exit == True or is_exit == '/exit':
+                            return '/exit'
+
+                        # Press esc to restore the input state after the function executed by 'esc'.
+                        on_render(text, False)
+
+                    # Render the button pressed.
+                    case None if key.is_sequence is False and key != "":
+                        text += key
+                        on_render(text, False)
 
         return text
 
     @staticmethod
-    def register_hotkey(term: Terminal, hotkey_list: list[Dict[str, any]], exit_key=None):
+    def register_hotkey(term: Terminal, keymap: Keymap, exit_key: str | None = None):
+        """
+        Returns a function listening to the hotkeys of a keymap until the exit key is pressed.
+
+        :param term: The terminal to read from.
+        :param keymap: The hotkeys, bound to functions taking no argument. A function returning
+                       '/exit' stops the listening and makes it return '/exit'.
+        :param exit_key: The name of the key that stops the listening, see `key_name`.
+        """
         def start_listening() -> str | None:
             with term.cbreak(), term.hidden_cursor():
                 while True:
                     try:
-                        key = term.inkey(timeout=0.1)
+                        name = key_name(KeyHandler.read_key(term))
 
-                        if not key:
-                            continue
-
-                        if exit_key is not None and exit_key(key):
+                        if name == exit_key:
                             break
 
-                        for hotkey in hotkey_list:
-                            if hotkey['condition'](key):
-                                command = hotkey['func']()
-
-                                if command == '/exit':
-                                    return '/exit'
+                        action = keymap.get(name)
+                        if action is not None and action() == '/exit':
+                            return '/exit'
                     except KeyboardInterrupt:
                         break
 
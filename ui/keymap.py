@@ -0,0 +1,105 @@
+from typing import Iterator, NamedTuple
+
+from blessed.keyboard import Keystroke
+
+
+def key_name(key: Keystroke) -> str:
+    """
+    Normalizes a key event to the name it is bound by.
+
+    Special keys are named as blessed names them ("KEY_UP", "KEY_ENTER"...), whatever sequence the
+    terminal sent for them, and the other keys by the character they type.
+
+    :param key: The key event.
+    :return: The name of the key.
+    """
+    if key.is_sequence:
+        return key.name or str(key)
+
+    return str(key)
+
+
+class Binding(NamedTuple):
+    action: any
+    # The key as shown in the shortcut tips, and what it does. Bindings without a label are not shown.
+    label: str = ""
+    description: str = ""
+
+
+class Keymap:
+    """
+    A table of key bindings, looked up by key name in constant time.
+
+    The action bound to a key is whatever the loop reading the keys expects: a callable for
+    hotkeys, or an action name for the menu and input loops. Keymaps are composed in layers, a
+    layer overriding the bindings of the keymaps below it, into a new keymap with a single table,
+    so that the number of layers and bindings does not change the cost of a keypress.
+    """
+
+    def __init__(self, bindings: dict[str, Binding] | None = None) -> None:
+        self.__bindings = dict(bindings or {})
+
+    def bind(self, keys: str | tuple[str, ...], action: any, label: str = "", description: str = "") -> "Keymap":
+        """
+        Binds an action to one or more keys.
+
+        :param keys: The name of the key, see `key_name`, or a tuple of names.
+        :param action: The action run when one of the keys is pressed.
+        :param label: The key as shown in the shortcut tips. Only the first key of a tuple gets it.
+        :param description: What the action does, shown after the label.
+        :return: The keymap itself, for chaining.
+        """
+        if isinstance(keys, str):
+            keys = (keys,)
+
+        for i, key in enumerate(keys):
+            self.__bindings[key] = Binding(action, label if i == 0 else "", description if i == 0 else "")
+
+        return self
+
+    def layer(self, *layers: "Keymap") -> "Keymap":
+        """
+        Returns a new keymap with the given layers on top of this one, the last layer on top.
+        """
+        bindings = dict(self.__bindings)
+
+        for layer in layers:
+            bindings.update(layer.__bindings)
+
+        return Keymap(bindings)
+
+    def get(self, key: Keystroke | str, default: any = None) -> any:
+        """
+        Returns the action bound to a key.
+
+        :param key: The key event, or its name.
+        :param default: The value returned when the key is not bound.
+        """
+        binding = self.__bindings.get(key if type(key) is str else key_name(key))
+
+        return default if binding is None else binding.action
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.__bindings
+
+    def labels(self) -> Iterator[tuple[str, str]]:
+        """
+        Yields the label and description of the labelled bindings, in the order they were bound.
+        """
+        for binding in self.__bindings.values():
+            if binding.label:
+                yield binding.label, binding.description
+
+
+# The keys of the menus, bound to the name of the action taken.
+MENU_KEYMAP = (Keymap()
+               .bind("KEY_UP", "previous")
+               .bind("KEY_DOWN", "next")
+               .bind("KEY_ENTER", "select")
+               .bind("KEY_ESCAPE", "back"))
+
+# The keys of the text input, bound to the name of the action taken. Other characters are typed.
+INPUT_KEYMAP = (Keymap()
+                .bind("KEY_ENTER", "submit")
+                .bind("KEY_BACKSPACE", "delete")
+                .bind("KEY_ESCAPE", "escape"))
@@ -0,0 +1,81 @@
+"""
+Caches of the fragments the screen is built from, so that drawing a frame mostly joins strings
+that were built once: the three lines of each tile by letter and color, the empty rows of the
+board by word length, and the centered menu options.
+"""
+from functools import lru_cache
+
+from colorama import Fore
+
+from utils.utils import visible_length
+
+# The lines of a tile, from top to bottom.
+TILE_TOP = "┌───┐"
+TILE_BOTTOM = "└───┘"
+
+
+@lru_cache(maxsize=256)
+def tile(letter: str, color: str) -> tuple[str, str, str]:
+    """
+    Returns the three lines of a tile:
+        ┌───┐
+        │ A │
+        └───┘
+
+    :param letter: The letter shown in the tile, a space for an empty tile.
+    :param color: The color code of the tile.
+    :return: The top, middle and bottom lines of the tile.
+    """
+    return (f"{color}{TILE_TOP}{Fore.RESET}",
+            f"{color}│ {letter} │{Fore.RESET}",
+            f"{color}{TILE_BOTTOM}{Fore.RESET}")
+
+
+@lru_cache(maxsize=32)
+def empty_row(length: int) -> tuple[str, str, str]:
+    """
+    Returns the three lines of a row of empty tiles.
+
+    :param length: The number of tiles of the row.
+    """
+    return tuple(line * length for line in tile(" ", Fore.RESET))
+
+
+def row(boxes: list[dict[str, str]]) -> tuple[str, str, str]:
+    """
+    Returns the three lines of a row of tiles.
+
+    :param boxes: One single-entry dictionary per tile, mapping its letter to its color, or an
+                  empty dictionary for an empty tile.
+    """
+    tiles = [tile(*next(iter(box.items()))) if box else tile(" ", Fore.RESET) for box in boxes]
+
+    return (''.join([top for top, _, _ in tiles]),
+            ''.join([middle for _, middle, _ in tiles]),
+            ''.join([bottom for _, _, bottom in tiles]))
+
+
+@lru_cache(maxsize=64)
+def options(items: tuple[str, ...], columns: int, gap: int = 0, selected: int = 0) -> tuple[str, ...]:
+    """
+    Returns the lines of a menu, each option centered on the screen and the selected one highlighted.
+
+    :param items: The names of the options.
+    :param columns: The width of the screen.
+    :param gap: The number of empty lines between two options.
+    :param selected: The index of the selected option.
+    """
+    buffer = []
+
+    for i, option in enumerate(items):
+        prefix = f"> " if i == selected else ""
+        line = prefix + option
+
+        fill_space = (columns - visible_length(line) - len(prefix)) // 2
+
+        buffer.append((Fore.GREEN if i == selected else "") + (" " * fill_space + line) + Fore.RESET)
+
+        if i < len(items) - 1:
+            buffer.extend([""] * gap)
+
+    return tuple(buffer)
@@ -0,0 +1,66 @@
+import time
+
+from typing import Callable
+
+from .terminal_controller import TerminalController
+
+
+class RenderScheduler:
+    """
+    Collects the updates of the screen regions made while handling an event, and draws them in one frame.
+
+    Updating a region only records how to draw it, replacing any update of the same region not drawn
+    yet, so a region changed several times by one event is drawn once. `frame` then draws the marked
+    regions in a fixed order and flushes the terminal with a single write. Frames are requested before
+    waiting for the next key, and when keys come in faster than the frame rate (typing quickly over a
+    slow link, pasting), the frames in between are skipped.
+    """
+
+    def __init__(self, tc: TerminalController, regions: tuple[str, ...], max_fps: float = 60) -> None:
+        """
+        :param tc: The terminal controller the regions are drawn with.
+        :param regions: The names of the regions, in the order they are drawn. The region setting the
+                        cursor position should come last.
+        :param max_fps: The maximum number of frames per second while keys are pending, 0 for no limit.
+        """
+        self.__tc = tc
+        self.__order = {region: i for i, region in enumerate(regions)}
+        self.__interval = 1 / max_fps if max_fps > 0 else 0
+        self.__dirty = {}
+        self.__last_frame = 0.0
+
+    def mark(self, region: str, draw: Callable[[], any]) -> None:
+        """
+        Marks a region as changed.
+
+        :param region: The name of the region.
+        :param draw: Draws the new contents of the region with the terminal controller, without flushing.
+        """
+        self.__dirty[region] = draw
+
+    def discard(self) -> None:
+        """
+        Forgets the regions not drawn yet, for when the screen is about to be cleared.
+        """
+        self.__dirty.clear()
+
+    def frame(self, force: bool = True) -> bool:
+        """
+        Draws the changed regions and flushes the terminal.
+
+        :param force: If False, nothing is drawn when the last frame is more recent than the frame interval.
+        :return: True if a frame was flushed.
+        """
+        now = time.perf_counter()
+
+        if not force and now - self.__last_frame < self.__interval:
+            return False
+
+        for region in sorted(self.__dirty, key=self.__order.__getitem__):
+            self.__dirty[region]()
+
+        self.__dirty.clear()
+        self.__tc.flush()
+        self.__last_frame = now
+
+        return True
@@ -1,26 +1,43 @@
-import sys
 import colorama
 
 from colorama import Cursor
 from typing import Optional, Union, List
+from .backend import Backend, TerminalBackend
+from .frame_buffer import DEFAULT_STYLE, FrameBuffer
 
 
 class TerminalController:
-    def __init__(self) -> None:
-        colorama.init(autoreset=True)
+    CLEAR_SCREEN = colorama.ansi.CSI + "2J" + colorama.ansi.CSI + "H"
+    ENTER_ALTERNATE_SCREEN = colorama.ansi.CSI + "?1049h"
+    EXIT_ALTERNATE_SCREEN = colorama.ansi.CSI + "?1049l"
+
+    def __init__(self, backend: Backend | None = None, frame_buffer: bool = False) -> None:
+        """
+        :param backend: Where the output is written, the real terminal by default.
+        :param frame_buffer: If True, line writes are drawn into a frame buffer and `flush` only
+                             emits the cells that differ from what is already on screen.
+        """
+        self.__backend = backend if backend is not None else TerminalBackend()
         self.__commands = []
         self.__current_line = 1
 
+        self.__frame = FrameBuffer(self.__backend.get_size()[0]) if frame_buffer else None
+        # The cursor position requested by `move_to` in frame buffer mode, applied after the frame.
+        self.__cursor = None
+
     def clear_lines(self, start_line: int, end_line: Optional[int] = None) -> "TerminalController":
         if start_line < 1:
             raise ValueError("The line number must be greater than 0.")
 
-        if end_line is None:
+        if end_line is not None and end_line < start_line:
+            raise ValueError("The end line number must be greater than or equal to the start line number.")
+
+        if self.__frame is not None:
+            for line in range(start_line, (end_line or start_line) + 1):
+                self.__frame.set_line(line, ())
+        elif end_line is None:
             self.__commands.append(Cursor.POS(1, start_line) + colorama.ansi.clear_line())
         else:
-            if end_line < start_line:
-                raise ValueError("The end line number must be greater than or equal to the start line number.")
-
             for line in range(start_line, end_line + 1):
                 self.__commands.append(Cursor.POS(1, line) + colorama.ansi.clear_line())
 
@@ -42,11 +59,16 @@ class TerminalController:
 
         if end_line is None:
             text = content_lines[0] if content_lines else ""
-            self.__commands.append(
-                Cursor.POS(1, self.__current_line)
-                + colorama.ansi.clear_line()
-                + str(text)
-            )
+
+            if self.__frame is not None:
+                self.__frame.set_line(start_line, ())
+                self.__frame.write(start_line, 1, str(text))
+            else:
+                self.__commands.append(
+                    Cursor.POS(1, self.__current_line)
+                    + colorama.ansi.clear_line()
+                    + str(text)
+                )
 
             self.__current_line = start_line
         else:
@@ -54,14 +76,22 @@ class TerminalController:
                 raise ValueError("The end line number must be greater than or equal to the start line number.")
 
             total_lines = end_line - start_line + 1
+            # The lines go out one after the other, so a style left open by a line carries over to the next.
+            style = DEFAULT_STYLE
 
             if len(content_lines) < total_lines:
-                content_lines += [''] * (total_lines - len(content_lines))
+                content_lines = [*content_lines, *[''] * (total_lines - len(content_lines))]
             else:
                 content_lines = content_lines[:total_lines]
 
             for i, text in enumerate(content_lines):
                 line = start_line + i
+
+                if self.__frame is not None:
+                    self.__frame.set_line(line, ())
+                    style = self.__frame.write(line, 1, str(text), style)
+                    continue
+
                 self.__commands.append(
                     Cursor.POS(1, line)
                     + colorama.ansi.clear_line()
@@ -73,13 +103,19 @@ class TerminalController:
         return self
 
     def move_to(self, line: int, column: int = 1) -> "TerminalController":
-        self.__commands.append(Cursor.POS(column, line))
+        if self.__frame is not None:
+            self.__cursor = (line, column)
+        else:
+            self.__commands.append(Cursor.POS(column, line))
         self.__current_line = line
 
         return self
 
     def write_at(self, line: int, column: int, text: str) -> "TerminalController":
-        self.__commands.append(Cursor.POS(column, line) + text)
+        if self.__frame is not None:
+            self.__frame.write(line, column, text)
+        else:
+            self.__commands.append(Cursor.POS(column, line) + text)
         self.__current_line = line
 
         return self
@@ -106,9 +142,16 @@ class TerminalController:
         return self
 
     def flush(self) -> "TerminalController":
-        if self.__commands:
-            sys.stdout.write("".join(self.__commands))
-            sys.stdout.flush()
+        if self.__frame is not None:
+            self.__commands.append(self.__frame.render())
+
+            if self.__cursor is not None:
+                self.__commands.append(Cursor.POS(self.__cursor[1], self.__cursor[0]))
+                self.__cursor = None
+
+        if any(self.__commands):
+            self.__backend.write("".join(self.__commands))
+            self.__backend.flush()
             self.__commands = []
 
         return self
@@ -118,6 +161,46 @@ class TerminalController:
 
         return self
 
+    def get_backend(self) -> Backend:
+        return self.__backend
+
+    def clear_screen(self) -> "TerminalController":
+        """
+        Clears the screen, dropping the commands not flushed yet. The clearing is sent with the
+        next flush, so that it reaches the terminal in the same write as the new frame.
+        """
+        self.__commands = [self.CLEAR_SCREEN]
+
+        return self.screen_cleared()
+
+    def enter_alternate_screen(self) -> "TerminalController":
+        """
+        Switches to the alternate screen of the terminal, keeping what was on the screen until
+        `exit_alternate_screen`.
+        """
+        self.clear_screen()
+        self.__commands.insert(0, self.ENTER_ALTERNATE_SCREEN)
+
+        return self.flush()
+
+    def exit_alternate_screen(self) -> "TerminalController":
+        """
+        Switches back to the screen the terminal was showing before `enter_alternate_screen`.
+        """
+        self.__commands = [colorama.ansi.Style.RESET_ALL, self.EXIT_ALTERNATE_SCREEN]
+
+        return self.screen_cleared().flush()
+
+    def screen_cleared(self) -> "TerminalController":
+        """
+        Tells the frame buffer that the screen has been cleared, so that the next frame is drawn in full.
+        """
+        if self.__frame is not None:
+            self.__frame.clear()
+            self.__cursor = None
+
+        return self
+
     def deinit(self):
         colorama.deinit()
 
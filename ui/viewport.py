@@ -0,0 +1,91 @@
+class Viewport:
+    """
+    The rows of the game board and the window of them shown in the display area.
+
+    The board is kept as one entry per row of tiles, each the few screen lines drawing it, rather
+    than as one flat list of lines. Setting a row replaces a single entry, and only the lines inside
+    the window are built when the display is rendered, so the cost of a guess or a scroll depends on
+    the height of the display area and not on the size of the board.
+
+    The structure of the board is as follows, the line number being on the middle line of a row:
+        ┌───┐
+     1  │ A │
+        └───┘
+    """
+
+    # The width of the line number column.
+    PREFIX_WIDTH = 3
+
+    def __init__(self, rows: int, row_height: int, empty_row: tuple[str, ...], height: int) -> None:
+        """
+        :param rows: The number of rows of the board.
+        :param row_height: The number of screen lines of a row.
+        :param empty_row: The lines of a row without any guess.
+        :param height: The number of lines of the display area.
+        """
+        self.__row_height = row_height
+        self.__height = height
+        self.__rows = [empty_row] * rows
+        # The line number column of each line of a row, the number being on the middle line.
+        self.__prefixes = [[f"{row + 1:2d} " if offset == row_height // 2 else " " * self.PREFIX_WIDTH
+                            for offset in range(row_height)] for row in range(rows)]
+        # The first board line shown at the top of the display area.
+        self.__top = 0
+
+    def get_top(self) -> int:
+        return self.__top
+
+    def get_height(self) -> int:
+        return self.__height
+
+    def get_line_count(self) -> int:
+        return len(self.__rows) * self.__row_height
+
+    def get_max_top(self) -> int:
+        return max(0, self.get_line_count() - self.__height)
+
+    def is_scrollable(self) -> bool:
+        return self.get_line_count() > self.__height
+
+    def set_row(self, row: int, lines: tuple[str, ...]) -> None:
+        """
+        Replaces the lines of a row of the board.
+
+        :param row: The 0-based index of the row.
+        :param lines: The lines drawing the row, without the line number.
+        """
+        self.__rows[row] = lines
+
+    def scroll_to(self, top: int) -> None:
+        """
+        Moves the window so that it starts at the given board line, within the bounds of the board.
+        """
+        self.__top = min(max(0, top), self.get_max_top())
+
+    def scroll(self, step: int) -> None:
+        """
+        Moves the window by a number of lines, up when negative.
+        """
+        self.scroll_to(self.__top + step)
+
+    def is_row_visible(self, row: int) -> bool:
+        """
+        Returns whether every line of a row is inside the window.
+        """
+        first = row * self.__row_height
+
+        return self.__top <= first and first + self.__row_height <= self.__top + self.__height
+
+    def visible_lines(self) -> list[str]:
+        """
+        Builds the lines shown in the window, with the line numbers.
+
+        :return: At most `height` lines, from the top of the window.
+        """
+        lines = []
+
+        for i in range(self.__top, min(self.__top + self.__height, self.get_line_count())):
+            row, offset = divmod(i, self.__row_height)
+            lines.append(self.__prefixes[row][offset] + self.__rows[row][offset])
+
+        return lines
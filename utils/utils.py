@@ -3,25 +3,17 @@ import sys
 import os
 
 from colorama import Fore
+from functools import lru_cache
 from pathlib import Path
 from ui.font_style import italic
 from wcwidth import wcswidth
 
 RESOURCES_PATH = "resources"
 
-
-def clear_screen() -> None:
-    """
-    Clears the terminal screen.
-
-    This function simply runs either 'cls' (on Windows) or 'clear' (on Unix-like systems) using the
-    os.system() call. It does not do any advanced error checking or handling.
-
-    :rtype: None
-    """
-    os.system('cls' if os.name == 'nt' else 'clear')
+ANSI_ESCAPE = re.compile(r'\x1B\[[0-?]*[ -/]*[@-~]')
 
 
+@lru_cache(maxsize=1024)
 def visible_length(text: str) -> int:
     """
     Calculates the visible length of a string, accounting for the removal of ANSI escape sequences
@@ -33,9 +25,8 @@ def visible_length(text: str) -> int:
     :param text: The input string containing potential ANSI escape sequences and characters.
     :return: The visible length of the string, considering the display width of each character.
     """
-    # Remove ANSI escape sequences (keep the original regular expression)
-    ansi_escape = re.compile(r'\x1B\[[0-?]*[ -/]*[@-~]')
-    clean_text = ansi_escape.sub('', text)
+    # Remove ANSI escape sequences
+    clean_text = ANSI_ESCAPE.sub('', text)
 
     # Use wcswidth to calculate the display width (handling full-width characters like Chinese characters)
     return wcswidth(clean_text)
@@ -104,102 +95,6 @@ def get_terminal_size() -> tuple:
     return columns, lines
 
 
-def render_line_numb(arr: list[str]) -> list[str]:
-    """
-    This function handles the list of strings and adds the line number in front of the index that matches formula 3n - 2,
-    start with an index of 1. The line numbers are formatted as two digits wide.
-
-    :param arr: The list of strings to process.
-    :type arr: list[str]
-
-    :return: A new list where every third element (starting from the second) has a line number
-             prepended to it. Other elements remain unchanged, with a space padding where no
-             line number is added.
-    :rtype: list[str]
-    """
-    result = []
-    count = 1
-
-    for i, item in enumerate(arr):
-        # Add line number every third element starting from the second
-        if (i + 2) % 3 == 0:
-            prefix_numb = f"{count:2d} "
-            count += 1
-        else:
-            prefix_numb = " " * 3
-
-        result.append(prefix_numb + item)
-
-    return result
-
-
-def overwrite_with_prefix(list_a, list_b, start_index) -> list[str]:
-    """
-    This function overwrites elements of list_a with elements from list_b starting from the specified
-    start_index. It keeps the first 3 characters of each element in list_a and appends the corresponding
-    element from list_b. If list_b is longer than the part of list_a being overwritten, the remaining
-    elements of list_b are appended to the end of the result.
-
-    :param list_a: The original list whose elements will be overwritten.
-    :type list_a: list of str
-    :param list_b: The list whose elements will replace parts of list_a.
-    :type list_b: list of str
-    :param start_index: The index in list_a from which the overwriting will begin.
-    :type start_index: int
-
-    :return: A new list with elements from list_b overwriting parts of list_a,
-             preserving the first 3 characters of the elements in list_a.
-    :rtype: list of str
-    """
-    # Create a copy of list_a to avoid modifying the original list
-    result = list_a.copy()
-
-    # Ensure start_index is within a valid range
-    if start_index < 0:
-        start_index = 0
-    elif start_index > len(result):
-        start_index = len(result)
-
-    # Iterate through list_b to perform the overwrite operation
-    for i in range(len(list_b)):
-        idx = start_index + i
-
-        if idx < len(result):
-            # Retain the first 3 characters of the original element and overwrite with list_b's element
-            # Handles cases where the string is shorter than 3 characters
-            prefix = result[idx][:3]
-            result[idx] = prefix + list_b[i]
-        else:
-            # If the index exceeds the length of list_a, append list_b's element
-            result.append(list_b[i])
-
-    return result
-
-
-def nearest_divisible_by_3(a, direction) -> int:
-    """
-    This function returns the nearest number divisible by 3 based on the given direction.
-    It either rounds up or rounds down to the nearest multiple of 3.
-
-    :param a: The number to be rounded to the nearest multiple of 3.
-    :type a: int
-    :param direction: The direction to round to. Should be either 'up' (round up) or 'down' (round down).
-    :type direction: str
-
-    :return: The nearest number divisible by 3 based on the direction specified.
-    :rtype: int
-    """
-    if a == 0:
-        return 0
-
-    v = a % 3
-
-    if direction == "up":
-        return a - v + 3
-    else:
-        return a - v
-
-
 def load_key_value_file(file_path: str | Path) -> dict:
     """
     Loads key-value pairs from a plain text file and returns them as a dictionary.